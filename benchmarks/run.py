@@ -0,0 +1,158 @@
+"""
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+
+Time and peak memory of the main Flight operations on synthetic flights.
+
+    python -m benchmarks.run                      # compare against benchmarks/baseline.json
+    python -m benchmarks.run --save               # record a new baseline
+    python -m benchmarks.run --durations 600 --log test/ekfv3_test.BIN
+
+The comparison fails (exit code 2) when there is no baseline, baselines depend on the machine so
+none is committed, record one with --save first. from_log is only benchmarked when a bin file is
+passed with --log, no log ships with the repository.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict
+
+import numpy as np
+
+from flightdata.fields import Fields
+from flightdata.data import Flight
+from flightdata.transform import Transformation
+from benchmarks.synthetic import synthetic_flight, LAYOUTS
+
+
+BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+DURATIONS = [600, 3600, 36000]  # 10 minutes to 10 hours
+
+
+class Case(object):
+    """the inputs shared by the operations for one synthetic flight"""
+    def __init__(self, directory: str, duration: float, layout: str):
+        self.duration = duration
+        self.layout = layout
+        self.flight = synthetic_flight(duration, layout)
+        self.csv_path = os.path.join(directory, '{}_{}.csv'.format(layout, duration))
+        self.store_path = os.path.join(directory, '{}_{}.fds'.format(layout, duration))
+        self.flight.to_csv(self.csv_path)
+        self.flight.to_store(self.store_path)
+        rng = np.random.default_rng(0)
+        self.times = rng.uniform(0, duration, 100000)
+
+
+def _subset(case: Case):
+    for start in np.linspace(0, case.duration / 2, 100):
+        case.flight.subset(start, start + case.duration / 4).read_numpy(Fields.POSITION)
+
+
+def _read_closest(case: Case):
+    for t in case.times[:1000]:
+        case.flight.read_closest(Fields.POSITION.names, t)
+
+
+OPERATIONS: Dict[str, Callable[[Case], object]] = {
+    'from_csv': lambda case: Flight.from_csv(case.csv_path),
+    'from_csv_fields': lambda case: Flight.from_csv(case.csv_path, [Fields.POSITION, Fields.ATTITUDE]),
+    'from_store': lambda case: Flight.from_store(case.store_path).read_numpy(Fields.POSITION),
+    'subset': _subset,
+    'transform': lambda case: case.flight.transform({i: lambda *x: x for i in range(0, 7)}),
+    'transform_arrays': lambda case: case.flight.transform_arrays(
+        Transformation(1.0, case.flight.origin()).handlers()),
+    'read_closest': _read_closest,
+    'read_times': lambda case: case.flight.read_times(Fields.POSITION, case.times),
+    'origin': lambda case: case.flight.origin(),
+}
+
+
+# the per row transform takes minutes on the longest flights, so it is only run up to these durations
+MAX_DURATIONS = {'transform': 3600}
+
+
+def measure(operation: Callable, *args, repeat: int = 3) -> Dict[str, float]:
+    """best wall time over repeat runs and the peak python memory allocated by one run"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        operation(*args)
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    operation(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return dict(time=min(times), peak=peak)
+
+
+def run(durations, layouts, log_path=None, repeat: int = 3, report: Callable = print) -> Dict[str, Dict]:
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for duration in durations:
+            for layout in layouts:
+                case = Case(directory, duration, layout)
+                for name, operation in OPERATIONS.items():
+                    if duration > MAX_DURATIONS.get(name, np.inf):
+                        continue
+                    key = '{}/{}/{}'.format(name, layout, duration)
+                    results[key] = measure(operation, case, repeat=1 if duration > 3600 else repeat)
+                    report('{:40s} {time:10.4f} s {peak:14,d} B'.format(key, **results[key]))
+                del case
+    if log_path is not None:
+        key = 'from_log/{}'.format(os.path.basename(log_path))
+        results[key] = measure(Flight.from_log, log_path, repeat=1)
+        report('{:40s} {time:10.4f} s {peak:14,d} B'.format(key, **results[key]))
+    return results
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float) -> list:
+    """the measurements that are worse than the baseline by more than tolerance"""
+    regressions = []
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+        for metric in ['time', 'peak']:
+            if result[metric] > baseline[key][metric] * (1 + tolerance):
+                regressions.append((key, metric, baseline[key][metric], result[metric]))
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='benchmark the Flight operations')
+    parser.add_argument('--durations', type=float, nargs='+', default=DURATIONS, help='flight lengths in seconds')
+    parser.add_argument('--layouts', nargs='+', default=LAYOUTS, choices=LAYOUTS)
+    parser.add_argument('--log', default=None, help='a bin file to benchmark from_log with')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed fractional slow down')
+    parser.add_argument('--save', action='store_true', help='store the results as the baseline')
+    args = parser.parse_args()
+
+    results = run(args.durations, args.layouts, args.log, args.repeat)
+
+    if args.save:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    elif not os.path.exists(args.baseline):
+        print('no baseline at {}, nothing was compared. Record one with --save'.format(args.baseline),
+              file=sys.stderr)
+        sys.exit(2)
+    else:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for key, metric, before, after in regressions:
+            print('REGRESSION {} {}: {:.4g} -> {:.4g}'.format(key, metric, before, after))
+        sys.exit(1 if len(regressions) > 0 else 0)
@@ -0,0 +1,64 @@
+"""
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+
+Time to import the package in a fresh interpreter, as paid by every CLI call and worker process.
+
+    python -m benchmarks.startup                  # best of 5 imports of `from flightdata import Flight`
+    python -m benchmarks.startup --limit 1.0      # fail if slower than 1 s or a deferred module is loaded
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import List, Tuple
+
+
+STATEMENT = 'from flightdata import Flight'
+
+# slow to import and only needed for unit conversion and reading logs, they must not load with the package
+DEFERRED = ['pint', 'ardupilot_log_reader', 'pymavlink']
+
+_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start)
+print(','.join(sorted(name for name in sys.modules if name.split('.')[0] in {deferred!r})))
+"""
+
+
+def measure(statement: str = STATEMENT, repeat: int = 5) -> Tuple[float, List[str]]:
+    """the best import time (seconds) over repeat new interpreters and the deferred modules that were loaded"""
+    script = _SCRIPT.format(statement=statement, deferred=DEFERRED)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    times, loaded = [], []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, '-c', script], cwd=root, capture_output=True, text=True, check=True
+        ).stdout.splitlines()
+        times.append(float(output[0]))
+        loaded = [name for name in output[1].split(',') if len(name) > 0]
+    return min(times), loaded
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='benchmark the package import time')
+    parser.add_argument('--statement', default=STATEMENT)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--limit', type=float, default=None, help='fail above this many seconds')
+    args = parser.parse_args()
+
+    seconds, loaded = measure(args.statement, args.repeat)
+    print('{:40s} {:10.4f} s'.format(args.statement, seconds))
+    for name in loaded:
+        print('DEFERRED MODULE LOADED {}'.format(name))
+    sys.exit(1 if len(loaded) > 0 or (args.limit is not None and seconds > args.limit) else 0)
@@ -0,0 +1,108 @@
+"""
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import numpy as np
+import pandas as pd
+
+from flightdata.fields import Fields
+from flightdata.data import Flight
+
+
+# the rate (Hz) each field is logged at in the sparse layout, the rest are logged at the base rate
+_rates = {
+    Fields.GLOBALPOSITION.name: 5,
+    Fields.GPSSATCOUNT.name: 5,
+    Fields.TXCONTROLS.name: 25,
+    Fields.SERVOS.name: 25,
+    Fields.FLIGHTMODE.name: 1,
+    Fields.BATTERY.name: 10,
+    Fields.CURRENT.name: 10,
+    Fields.RPM.name: 10,
+    Fields.MAGNETOMETER.name: 10,
+}
+
+LAYOUTS = ['dense', 'sparse']
+
+ORIGIN = dict(latitude=51.4594152, longitude=-2.7913069)
+
+
+def _columns(time: np.ndarray, rng: np.random.Generator) -> dict:
+    """a plausible value for every field column at each time, circuits of a 200m circle"""
+    n = len(time)
+    phase = time * 2 * np.pi / 60
+    noise = lambda scale: rng.normal(0, scale, n)
+
+    north, east, down = 200 * np.sin(phase), 200 * (1 - np.cos(phase)), -100 + 20 * np.sin(phase / 3)
+    columns = {
+        'position_x': north, 'position_y': east, 'position_z': down,
+        'velocity_x': 200 * np.cos(phase) * 2 * np.pi / 60,
+        'velocity_y': 200 * np.sin(phase) * 2 * np.pi / 60,
+        'velocity_z': noise(0.5),
+        'acceleration_x': noise(1), 'acceleration_y': noise(1), 'acceleration_z': -9.81 + noise(2),
+        'attitude_roll': 0.5 + noise(0.05), 'attitude_pitch': noise(0.05),
+        'attitude_yaw': (phase + np.pi / 2) % (2 * np.pi),
+        'axis_rate_roll': noise(0.1), 'axis_rate_pitch': noise(0.1), 'axis_rate_yaw': noise(0.1),
+        'global_position_latitude': ORIGIN['latitude'] + np.degrees(north / 6378137.0),
+        'global_position_longitude': ORIGIN['longitude'] + np.degrees(
+            east / 6378137.0 / np.cos(np.radians(ORIGIN['latitude']))),
+        'gps_sat_count_0': np.clip(np.round(14 + 4 * np.sin(phase / 7)), 0, None),
+        'altitude_gps': -down + noise(1), 'altitude_baro': -down + noise(0.3),
+        'battery_0': 16.8 - 4 * time / time[-1], 'battery_1': 5 + noise(0.01),
+        'current_0': 20 + noise(2), 'current_1': noise(0.1), 'current_2': noise(0.1), 'current_3': noise(0.1),
+        'airspeed_0': 30 + noise(1), 'airspeed_1': 30 + noise(1),
+        'wind_x': 3 + noise(0.1), 'wind_y': -2 + noise(0.1),
+        'rpm_0': 8000 + noise(100), 'rpm_1': 8000 + noise(100),
+        'magnetometer_0': 200 + noise(3), 'magnetometer_1': noise(3), 'magnetometer_2': 420 + noise(3),
+    }
+    # a mode change every 5 minutes, cycling through manual, stabilize, acro and fbwa
+    mode = np.array([0, 2, 4, 5])[(time // 300).astype(int) % 4]
+    columns.update({'mode_0': mode, 'mode_1': mode, 'mode_2': np.full(n, 1)})
+    for i in range(8):
+        columns['tx_controls_{}'.format(i)] = np.round(1500 + 400 * np.sin(phase + i))
+        columns['servos_{}'.format(i)] = np.round(1500 + 400 * np.sin(phase + i + 0.1))
+    return columns
+
+
+def synthetic_flight(duration: float, layout: str = 'dense', rate: float = 10, seed: int = 0) -> Flight:
+    """Generate a flight of duration seconds with every field populated.
+
+    Args:
+        duration (float): length of the flight in seconds
+        layout (str, optional): dense, every column in every row like a csv export, or sparse, each field
+            only in the rows at its own logging rate and NaN elsewhere like Flight.from_log. Defaults to 'dense'.
+        rate (float, optional): rows per second. Defaults to 10.
+        seed (int, optional): seed for the sensor noise. Defaults to 0.
+    """
+    if layout not in LAYOUTS:
+        raise ValueError('unknown layout {}'.format(layout))
+    rng = np.random.default_rng(seed)
+    time = np.arange(0, duration, 1 / rate)
+    columns = _columns(time, rng)
+
+    if layout == 'sparse':
+        for field in Fields.all():
+            field_rate = _rates.get(field.name, rate)
+            if field_rate < rate:
+                skip = np.arange(len(time)) % int(rate / field_rate) != 0
+                for name in field.names:
+                    columns[name] = np.where(skip, np.nan, columns[name])
+
+    zero_time = 1000.0
+    columns['time_flight'] = time + zero_time
+    columns['time_actual'] = time + zero_time
+    data = pd.DataFrame(columns, index=pd.Index(time + zero_time, name='time_index'))
+    return Flight(data[Fields.all_names()])
+
+
+def write_synthetic(filename, duration: float, layout: str = 'dense', rate: float = 10, seed: int = 0):
+    """write a synthetic flight in the csv format read by Flight.from_csv"""
+    synthetic_flight(duration, layout, rate, seed).to_csv(filename)
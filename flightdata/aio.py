@@ -0,0 +1,111 @@
+"""
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import asyncio
+import concurrent.futures
+import os
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Dict
+
+from flightdata.data import Flight
+
+
+class _Pending(object):
+    def __init__(self, load: concurrent.futures.Future):
+        self.load = load  # the call on the executor
+        self.future = asyncio.wrap_future(load)
+        self.waiters = 0
+
+
+class AsyncLoader(object):
+    """Awaitable flight loaders for use from an event loop. Loads run on a bounded executor,
+    concurrent requests for the same file and options share one load, and a load nobody is
+    waiting for any more is cancelled if it has not started. A load that has started runs to the
+    end, requests for it made meanwhile wait for it rather than starting another.
+
+    The Flight returned to concurrent requests for the same file is the same object, copy it before modifying it.
+
+    Parsing a log is pure python and holds the GIL, so on the default thread pool loads overlap
+    with the event loop and with file io but do not parse in parallel. To parse several logs at
+    once pass a concurrent.futures.ProcessPoolExecutor, the loader and its arguments must then be
+    picklable and each Flight is pickled back to this process.
+
+    Args:
+        max_workers (int, optional): number of loads that run at once. Defaults to 4.
+        executor (Executor, optional): run the loads on this executor instead, it is not shut down by close().
+    """
+    def __init__(self, max_workers: int = 4, executor: Executor = None):
+        self._owns_executor = executor is None
+        self.executor = ThreadPoolExecutor(max_workers, 'flightdata') if executor is None else executor
+        self._pending: Dict[tuple, _Pending] = {}
+
+    def close(self):
+        if self._owns_executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        self.close()
+
+    @staticmethod
+    def _key(function: Callable, path, kwargs: Dict) -> tuple:
+        return (
+            getattr(function, '__qualname__', repr(function)),
+            os.path.abspath(path),
+            tuple(sorted((name, repr(value)) for name, value in kwargs.items()))
+        )
+
+    async def load(self, function: Callable, path, **kwargs):
+        """Call function(path, **kwargs) on the executor, or wait for the same call already in progress.
+
+        Args:
+            function (Callable): the loader, for example Flight.from_log
+            path (str): the file to load
+
+        Returns:
+            the result of function
+        """
+        key = self._key(function, path, kwargs)
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = _Pending(self.executor.submit(partial(function, path, **kwargs)))
+            pending.future.add_done_callback(lambda _: self._forget(key, pending))
+
+        pending.waiters += 1
+        try:
+            # shield so that cancelling one request does not cancel the load for the others
+            return await asyncio.shield(pending.future)
+        finally:
+            pending.waiters -= 1
+            # the last request was cancelled, drop the load if it is still queued. one that is
+            # running cannot be stopped, it stays pending until it finishes
+            if pending.waiters == 0 and pending.load.cancel():
+                self._forget(key, pending)
+
+    def _forget(self, key: tuple, pending: _Pending):
+        if self._pending.get(key) is pending:
+            del self._pending[key]
+
+    async def from_log(self, log_path, **kwargs) -> Flight:
+        """see Flight.from_log"""
+        return await self.load(Flight.from_log, log_path, **kwargs)
+
+    async def from_csv(self, filename, **kwargs) -> Flight:
+        """see Flight.from_csv"""
+        return await self.load(Flight.from_csv, filename, **kwargs)
+
+    async def from_store(self, filename, **kwargs) -> Flight:
+        """see Flight.from_store"""
+        return await self.load(Flight.from_store, filename, **kwargs)
@@ -0,0 +1,161 @@
+"""
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import argparse
+import fnmatch
+import os
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, List, Union
+
+from flightdata.data import Flight
+from flightdata.catalog import Catalog, summarise
+
+
+class BatchResult(object):
+    def __init__(self, log_path: str, output_path: str, error: str = None, skipped: bool = False,
+                 summary: dict = None):
+        self.log_path = log_path
+        self.output_path = output_path
+        self.error = error
+        self.skipped = skipped
+        self.summary = summary  # the catalog summary, when a catalog is being filled
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self):
+        status = 'skipped' if self.skipped else 'ok' if self.ok else 'failed'
+        return 'BatchResult({}, {})'.format(self.log_path, status)
+
+
+def find_logs(source: Union[str, List[str]], pattern: str = '*.BIN') -> List[str]:
+    """the files matching pattern (case insensitive) in a directory, or the list of files passed"""
+    if isinstance(source, (list, tuple)):
+        return list(source)
+    return sorted(
+        os.path.join(source, name) for name in os.listdir(source)
+        if fnmatch.fnmatch(name.lower(), pattern.lower())
+    )
+
+
+def output_path(log_path: str, output_dir: str) -> str:
+    return os.path.join(output_dir, os.path.splitext(os.path.basename(log_path))[0] + '.fds')
+
+
+def _ingest_one(log_path: str, output: str, loader: Callable, summary: bool) -> BatchResult:
+    try:
+        flight = loader(log_path)
+        # write to a temporary file so an interrupted batch never leaves a partial store behind,
+        # and summarise before it is renamed so a resumed batch does not skip an uncatalogued store
+        temp_path = output + '.tmp'
+        flight.to_store(temp_path)
+        _summary = summarise(flight) if summary else None
+        os.replace(temp_path, output)
+        return BatchResult(log_path, output, summary=_summary)
+    except Exception:
+        return BatchResult(log_path, output, error=traceback.format_exc())
+
+
+def _skip_one(log_path: str, output: str, summary: bool) -> BatchResult:
+    try:
+        return BatchResult(log_path, output, skipped=True,
+                           summary=summarise(Flight.from_store(output)) if summary else None)
+    except Exception:
+        return BatchResult(log_path, output, skipped=True, error=traceback.format_exc())
+
+
+def ingest(source: Union[str, List[str]], output_dir: str, workers: int = None, resume: bool = True,
+           loader: Callable = Flight.from_log, pattern: str = '*.BIN',
+           progress: Callable[[int, int, BatchResult], None] = None,
+           catalog: Catalog = None) -> List[BatchResult]:
+    """Convert many logs to the columnar store (./store.py) in parallel.
+
+    Args:
+        source (Union[str, List[str]]): a directory to search for pattern, or a list of files
+        output_dir (str): where to write the stores, one per log named after it
+        workers (int, optional): number of processes. Defaults to the number of cpus.
+        resume (bool, optional): skip logs that already have a store in output_dir. Defaults to True.
+            When filling a catalog, a store that cannot be opened is converted again.
+        loader (Callable, optional): picklable function that reads a log into a Flight.
+            Defaults to Flight.from_log, use functools.partial to pass options.
+        pattern (str, optional): file pattern used when source is a directory. Defaults to '*.BIN'.
+        progress (Callable, optional): called with (number done, total, BatchResult) as each log completes.
+        catalog (Catalog, optional): add each store to this catalog, see ./catalog.py. The stores
+            skipped by resume are opened and added too.
+
+    Returns:
+        List[BatchResult]: one per log, failures carry the traceback in error. A log whose
+            worker died (BrokenProcessPool) fails, as do the logs still queued behind it.
+    """
+    logs = find_logs(source, pattern)
+    outputs = [output_path(log, output_dir) for log in logs]
+    if len(set(outputs)) < len(outputs):
+        raise ValueError('log file names must be unique, they name the output files')
+    os.makedirs(output_dir, exist_ok=True)
+
+    results = []
+
+    def _done(result):
+        results.append(result)
+        if catalog is not None and result.summary is not None:
+            catalog.add_summary(result.output_path, result.summary)
+        if progress is not None:
+            progress(len(results), len(logs), result)
+
+    todo = []
+    for log, output in zip(logs, outputs):
+        skipped = _skip_one(log, output, catalog is not None) if resume and os.path.exists(output) else None
+        if skipped is not None and skipped.ok:
+            _done(skipped)
+        else:
+            # a store that cannot be opened is converted again
+            todo.append((log, output))
+
+    if len(todo) > 0:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(_ingest_one, log, output, loader, catalog is not None): (log, output)
+                for log, output in todo
+            }
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception:
+                    # the worker process died, _ingest_one catches everything else
+                    result = BatchResult(*futures[future], error=traceback.format_exc())
+                _done(result)
+
+    return results
+
+
+def _print_progress(done: int, total: int, result: BatchResult):
+    print('[{}/{}] {}'.format(done, total, result))
+    if not result.ok:
+        print(result.error)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='convert a directory of ardupilot logs to flight stores')
+    parser.add_argument('source', help='directory containing the logs')
+    parser.add_argument('output_dir', help='directory to write the stores to')
+    parser.add_argument('-j', '--workers', type=int, default=None, help='number of processes')
+    parser.add_argument('--restart', action='store_true', help='reprocess logs that already have a store')
+    parser.add_argument('--catalog', default=None, help='sqlite catalog to add the new stores to')
+    args = parser.parse_args()
+
+    catalog = None if args.catalog is None else Catalog(args.catalog)
+    results = ingest(args.source, args.output_dir, args.workers, not args.restart,
+                     progress=_print_progress, catalog=catalog)
+    failed = [result for result in results if not result.ok]
+    print('{} logs, {} failed'.format(len(results), len(failed)))
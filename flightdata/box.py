@@ -0,0 +1,90 @@
+"""
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from typing import Dict
+import numpy as np
+
+from flightdata.fields import Fields
+from flightdata.transform import gps_to_local, rotate_xy
+
+
+class Box(object):
+    """An F3A competition box, defined by the pilot position and the box centre.
+    The box frame has its origin at the pilot, y towards the centre, x to the right and z up.
+
+    Args:
+        name (str): the site name
+        pilot_position (Dict[str, float]): latitude and longitude of the pilot
+        centre (Dict[str, float]): latitude and longitude of the box centre
+        distance (float, optional): the distance from the pilot to the box in metres
+    """
+    def __init__(self, name: str, pilot_position: Dict[str, float], centre: Dict[str, float], distance: float = None):
+        self.name = name
+        self.pilot_position = pilot_position
+        self.centre = centre
+        self.distance = distance
+        north, east = gps_to_local(
+            np.array([[centre['latitude'], centre['longitude']]]), pilot_position)[0]
+        self.heading = np.arctan2(east, north)  # radians clockwise from north
+
+    @staticmethod
+    def from_f3a(filename):
+        """read a box file written by F3A Zone: a comment line, the name, pilot latitude and
+        longitude, centre latitude and longitude and optionally the box distance"""
+        with open(filename) as f:
+            lines = [line.strip() for line in f.readlines() if len(line.strip()) > 0]
+        return Box(
+            name=lines[1],
+            pilot_position=dict(latitude=float(lines[2]), longitude=float(lines[3])),
+            centre=dict(latitude=float(lines[4]), longitude=float(lines[5])),
+            distance=float(lines[6]) if len(lines) > 6 else None
+        )
+
+    @property
+    def key(self) -> tuple:
+        return ('box', self.pilot_position['latitude'], self.pilot_position['longitude'], self.heading)
+
+    def from_local(self, north_east: np.ndarray) -> np.ndarray:
+        """(N, 2) north, east offsets from the pilot (metres) to box x, y"""
+        forward_right = rotate_xy(north_east, self.heading)
+        return forward_right[:, ::-1]
+
+    def from_gps(self, latlon: np.ndarray) -> np.ndarray:
+        """(N, 2) latitudes and longitudes (degrees) to box x, y"""
+        return self.from_local(gps_to_local(latlon, self.pilot_position))
+
+    def project(self, flight, field=Fields.POSITION) -> np.ndarray:
+        """Project every sample of a flight into the box frame, the result is cached on the flight.
+
+        Args:
+            flight (Flight): the flight to project
+            field (Field, optional): Fields.POSITION, the ekf position (n, e, d) relative to the
+                flight origin(), or Fields.GLOBALPOSITION. Defaults to Fields.POSITION.
+
+        Returns:
+            np.ndarray: (N, 3) box x, y, z for POSITION, (N, 2) box x, y for GLOBALPOSITION.
+                NaN where the field was not logged.
+        """
+        def _project():
+            values = flight.read_fields(field).to_numpy(dtype=float)
+            if field is Fields.GLOBALPOSITION:
+                projected = self.from_gps(values)
+            elif field is Fields.POSITION:
+                origin = flight.origin()
+                offset = gps_to_local(np.array([[origin['latitude'], origin['longitude']]]), self.pilot_position)
+                projected = np.column_stack([self.from_local(values[:, :2] + offset), -values[:, 2]])
+            else:
+                raise ValueError('can only project POSITION or GLOBALPOSITION into the box frame')
+            projected.setflags(write=False)
+            return projected
+        # the origin comes from the gps fields
+        return flight._cached(self.key + (field.name,), [field, Fields.GLOBALPOSITION, Fields.GPSSATCOUNT], _project)
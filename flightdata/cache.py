@@ -0,0 +1,125 @@
+"""
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import hashlib
+import os
+from typing import Optional
+
+from flightdata.fields import Fields
+from flightdata.mapping import get_ardupilot_mapping
+
+
+_EKF_TYPES = [2, 3]
+
+
+def mapping_version() -> str:
+    """A fingerprint of the ardupilot mapping tables.
+    The EKF type of a log is only known once it has been parsed, so the fingerprint covers
+    every table get_ardupilot_mapping can return. Any change to a mapping invalidates the cache.
+    """
+    digest = hashlib.sha256()
+    for ekf_type in _EKF_TYPES:
+        io_info = get_ardupilot_mapping(ekf_type)
+        for row in zip(io_info.io_names, io_info.base_names, io_info.factors_to_base):
+            digest.update(repr(row).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def file_hash(path, chunk_size: int = 2**20) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class LogCache(object):
+    """An on disk cache of parsed logs, stored in the columnar binary format (./store.py).
+
+    Entries are keyed by the content hash of the log, the mapping version and the options that
+    change the parse. When the total size exceeds max_size the least recently used entries are
+    removed. The modification time of an entry is its last use.
+    """
+    extension = '.fds'
+
+    def __init__(self, directory, max_size: int = 2**30):
+        self.directory = directory
+        self.max_size = max_size
+        self._hashes = {}
+        self._mapping_version = None
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, log_path, skip_start: bool, fields=None) -> str:
+        if self._mapping_version is None:
+            self._mapping_version = mapping_version()
+        # hashing a multi GB log is not free, so remember it while the file is unchanged
+        stat = os.stat(log_path)
+        stamp = (os.path.abspath(log_path), stat.st_size, stat.st_mtime_ns)
+        if stamp not in self._hashes:
+            self._hashes[stamp] = file_hash(log_path)
+        key = '{}_{}_{}'.format(self._hashes[stamp], self._mapping_version, bool(skip_start))
+        if fields is not None:
+            # a load of some fields is a different flight to a load of all of them
+            key += '_' + ','.join(sorted(set(Fields.some_names(fields))))
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.extension)
+
+    def get(self, key: str) -> Optional[str]:
+        """the path to the cached store for key, or None if it is not in the cache"""
+        path = self.path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, key: str, flight):
+        path = self.path(key)
+        temp_path = path + '.tmp'
+        flight.to_store(temp_path)
+        os.replace(temp_path, path)
+        self.evict(keep=path)
+
+    def entries(self):
+        """cached stores, least recently used first"""
+        _entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(self.extension):
+                path = os.path.join(self.directory, name)
+                stat = os.stat(path)
+                _entries.append((stat.st_mtime_ns, stat.st_size, path))
+        return sorted(_entries)
+
+    @property
+    def size(self) -> int:
+        return sum(entry[1] for entry in self.entries())
+
+    def evict(self, keep: str = None):
+        entries = self.entries()
+        total = sum(entry[1] for entry in entries)
+        for _, size, path in entries:
+            if total <= self.max_size:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                # still open elsewhere (windows does not allow removal of mapped files)
+                continue
+            total -= size
+
+    def clear(self):
+        for _, _, path in self.entries():
+            os.remove(path)
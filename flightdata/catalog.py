@@ -0,0 +1,226 @@
+"""
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import os
+import sqlite3
+from typing import Dict, List, Tuple, Union
+import numpy as np
+import pandas as pd
+
+from flightdata.fields import Fields
+from flightdata.data import Flight
+from flightdata.transform import EARTH_RADIUS
+from flightdata.config.ardupilot import flight_modes, flight_mode_id
+
+
+_schema = """
+CREATE TABLE IF NOT EXISTS flights (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    duration REAL,
+    zero_time REAL,
+    origin_latitude REAL,
+    origin_longitude REAL,
+    min_latitude REAL,
+    max_latitude REAL,
+    min_longitude REAL,
+    max_longitude REAL
+);
+CREATE TABLE IF NOT EXISTS modes (
+    flight_id INTEGER REFERENCES flights(id) ON DELETE CASCADE,
+    mode INTEGER,
+    PRIMARY KEY (flight_id, mode)
+);
+CREATE TABLE IF NOT EXISTS parameters (
+    flight_id INTEGER REFERENCES flights(id) ON DELETE CASCADE,
+    name TEXT,
+    value REAL,
+    PRIMARY KEY (flight_id, name)
+);
+CREATE INDEX IF NOT EXISTS flights_origin ON flights (origin_latitude, origin_longitude);
+CREATE INDEX IF NOT EXISTS flights_duration ON flights (duration);
+CREATE INDEX IF NOT EXISTS modes_mode ON modes (mode, flight_id);
+CREATE INDEX IF NOT EXISTS parameters_name ON parameters (name, value, flight_id);
+"""
+
+
+def summarise(flight: Flight) -> Dict:
+    """the values the catalog indexes for a flight, the origin, bounds and modes are left empty
+    when the GPS or flight mode columns were not read"""
+    columns = set(flight.data.columns)
+    origin = dict(latitude=None, longitude=None)
+    if columns.issuperset(Fields.some_names([Fields.GLOBALPOSITION, Fields.GPSSATCOUNT])):
+        try:
+            origin = flight.origin()
+        except IndexError:
+            # no fix with enough satellites
+            pass
+
+    bounds = dict(min_latitude=None, max_latitude=None, min_longitude=None, max_longitude=None)
+    if columns.issuperset(Fields.GLOBALPOSITION.names):
+        gps = flight.read_fields(Fields.GLOBALPOSITION).dropna()
+        if len(gps) > 0:
+            bounds = dict(
+                min_latitude=float(gps.iloc[:, 0].min()), max_latitude=float(gps.iloc[:, 0].max()),
+                min_longitude=float(gps.iloc[:, 1].min()), max_longitude=float(gps.iloc[:, 1].max()))
+
+    modes = []
+    if Fields.FLIGHTMODE.names[0] in columns:
+        modes = pd.unique(flight.data[Fields.FLIGHTMODE.names[0]].dropna().astype(float))
+
+    _parameters = flight.parameters if isinstance(flight.parameters, dict) else {}
+
+    return dict(
+        duration=float(flight.duration),
+        zero_time=float(flight.zero_time),
+        origin_latitude=origin['latitude'],
+        origin_longitude=origin['longitude'],
+        modes=[int(mode) for mode in modes],
+        parameters={name: float(value) for name, value in _parameters.items()},
+        **bounds
+    )
+
+
+class CatalogEntry(object):
+    """a handle on a catalogued flight, load() opens it"""
+    def __init__(self, path: str, duration: float, zero_time: float, origin: Dict[str, float], modes: List[int]):
+        self.path = path
+        self.duration = duration
+        self.zero_time = zero_time
+        self.origin = origin
+        self.modes = modes
+
+    @property
+    def mode_labels(self) -> List[str]:
+        return [flight_modes.get(mode, str(mode)) for mode in self.modes]
+
+    def load(self, mmap: bool = True) -> Flight:
+        return Flight.from_store(self.path, mmap)
+
+    def __repr__(self):
+        return 'CatalogEntry({}, {:.0f}s, {})'.format(self.path, self.duration, self.mode_labels)
+
+
+class Catalog(object):
+    """An sqlite index of many flight stores, for finding flights without loading them.
+
+    Args:
+        filename (str): the sqlite database, created if it does not exist
+        parameters (List[str], optional): the log parameters to index. Defaults to all of them.
+    """
+    def __init__(self, filename: str, parameters: List[str] = None):
+        self.filename = filename
+        self.parameters = parameters
+        self.connection = sqlite3.connect(filename)
+        self.connection.execute('PRAGMA foreign_keys = ON')
+        self.connection.executescript(_schema)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return self.connection.execute('SELECT COUNT(*) FROM flights').fetchone()[0]
+
+    def add(self, path: str, flight: Flight = None):
+        """index the flight stored at path, the store is opened if the flight is not passed"""
+        if flight is None:
+            flight = Flight.from_store(path)
+        self.add_summary(path, summarise(flight))
+
+    def add_summary(self, path: str, summary: Dict):
+        """index a flight from the output of summarise, replacing any existing entry for path"""
+        path = os.path.abspath(path)
+        parameters = summary['parameters']
+        if self.parameters is not None:
+            parameters = {name: parameters[name] for name in self.parameters if name in parameters}
+        with self.connection:
+            self.connection.execute('DELETE FROM flights WHERE path = ?', (path,))
+            flight_id = self.connection.execute(
+                """INSERT INTO flights (path, duration, zero_time, origin_latitude, origin_longitude,
+                min_latitude, max_latitude, min_longitude, max_longitude) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (path, summary['duration'], summary['zero_time'],
+                 summary['origin_latitude'], summary['origin_longitude'],
+                 summary['min_latitude'], summary['max_latitude'],
+                 summary['min_longitude'], summary['max_longitude'])
+            ).lastrowid
+            self.connection.executemany(
+                'INSERT INTO modes (flight_id, mode) VALUES (?, ?)',
+                [(flight_id, mode) for mode in summary['modes']])
+            self.connection.executemany(
+                'INSERT INTO parameters (flight_id, name, value) VALUES (?, ?, ?)',
+                [(flight_id, name, value) for name, value in parameters.items()])
+
+    def remove(self, path: str):
+        with self.connection:
+            self.connection.execute('DELETE FROM flights WHERE path = ?', (os.path.abspath(path),))
+
+    def query(self, near: Tuple[float, float, float] = None, min_duration: float = None,
+              max_duration: float = None, modes: List[Union[int, str]] = None,
+              parameters: Dict[str, float] = None) -> List[CatalogEntry]:
+        """Find the catalogued flights that match all of the conditions given.
+
+        Args:
+            near (Tuple[float, float, float], optional): (latitude, longitude, radius in metres),
+                flights whose origin is within radius of the point.
+            min_duration (float, optional): shortest flight in seconds.
+            max_duration (float, optional): longest flight in seconds.
+            modes (List[Union[int, str]], optional): flight modes (IDs or labels) that were all used.
+            parameters (Dict[str, float], optional): parameter values the flights were flown with.
+
+        Returns:
+            List[CatalogEntry]
+        """
+        conditions, values = [], []
+        if near is not None:
+            latitude, longitude, radius = near
+            # a bounding box the index can use, refined to the circle below
+            dlat = np.degrees(radius / EARTH_RADIUS)
+            dlon = dlat / max(np.cos(np.radians(latitude)), 1e-6)
+            conditions.append('origin_latitude BETWEEN ? AND ? AND origin_longitude BETWEEN ? AND ?')
+            values += [latitude - dlat, latitude + dlat, longitude - dlon, longitude + dlon]
+        if min_duration is not None:
+            conditions.append('duration >= ?')
+            values.append(min_duration)
+        if max_duration is not None:
+            conditions.append('duration <= ?')
+            values.append(max_duration)
+        for mode in [] if modes is None else modes:
+            conditions.append('id IN (SELECT flight_id FROM modes WHERE mode = ?)')
+            values.append(flight_mode_id(mode))
+        for name, value in ({} if parameters is None else parameters).items():
+            conditions.append('id IN (SELECT flight_id FROM parameters WHERE name = ? AND value = ?)')
+            values += [name, value]
+
+        rows = self.connection.execute(
+            """SELECT id, path, duration, zero_time, origin_latitude, origin_longitude FROM flights
+            {} ORDER BY path""".format('WHERE ' + ' AND '.join(conditions) if len(conditions) > 0 else ''),
+            values
+        ).fetchall()
+
+        entries = []
+        for flight_id, path, duration, zero_time, latitude, longitude in rows:
+            if near is not None:
+                north = np.radians(latitude - near[0]) * EARTH_RADIUS
+                east = np.radians(longitude - near[1]) * EARTH_RADIUS * np.cos(np.radians(near[0]))
+                if np.hypot(north, east) > near[2]:
+                    continue
+            modes_used = [row[0] for row in self.connection.execute(
+                'SELECT mode FROM modes WHERE flight_id = ? ORDER BY mode', (flight_id,))]
+            entries.append(CatalogEntry(
+                path, duration, zero_time, dict(latitude=latitude, longitude=longitude), modes_used))
+        return entries
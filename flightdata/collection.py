@@ -0,0 +1,65 @@
+"""
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from typing import List, Tuple
+import numpy as np
+
+from flightdata.fields import Fields
+from flightdata.data import Flight
+
+
+class FlightCollection(object):
+    """Many flights resampled onto a shared time base relative to the start of each flight,
+    held as one stacked (flights, time, channels) array so fleet statistics are single reductions.
+
+    Args:
+        flights (List[Flight]): the flights, for example the runs of a sequence from Flight.mode_subsets
+        fields (Field or List[Field]): the fields to sample, one channel per name
+        time_base (np.ndarray, optional): seconds from the start of each flight.
+            Defaults to rate samples a second over the shortest flight.
+        rate (float, optional): samples per second of the default time base. Defaults to 10.
+        method (str, optional): nearest, previous or linear, see Flight.read_times. Defaults to 'linear'.
+    """
+    def __init__(self, flights: List[Flight], fields, time_base: np.ndarray = None,
+                 rate: float = 10, method: str = 'linear'):
+        self.flights = flights
+        self.fields = fields
+        self.names = Fields.some_names(fields)
+        if time_base is None:
+            time_base = np.arange(0, min(flight.duration for flight in flights), 1 / rate)
+        self.time = np.asarray(time_base, dtype=float)
+
+        self.data = np.empty((len(flights), len(self.time), len(self.names)))
+        for i, flight in enumerate(flights):
+            self.data[i] = flight.read_times(fields, self.time, method)
+
+    def __len__(self):
+        return len(self.flights)
+
+    def channel(self, name: str) -> np.ndarray:
+        """the (flights, time) array of one column name"""
+        return self.data[:, :, self.names.index(name)]
+
+    def mean(self) -> np.ndarray:
+        """(time, channels) mean over the flights, ignoring NaN"""
+        return np.nanmean(self.data, axis=0)
+
+    def std(self) -> np.ndarray:
+        return np.nanstd(self.data, axis=0)
+
+    def percentile(self, q) -> np.ndarray:
+        """(time, channels) percentile over the flights, or (len(q), time, channels) for a list of q"""
+        return np.nanpercentile(self.data, q, axis=0)
+
+    def envelope(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(time, channels) minimum and maximum over the flights"""
+        return np.nanmin(self.data, axis=0), np.nanmax(self.data, axis=0)
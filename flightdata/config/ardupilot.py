@@ -36,3 +36,13 @@ flight_modes = {
     22: 'QAUTOTUNE',
     23: 'QACRO',
     }
+
+
+def flight_mode_id(mode) -> int:
+    """the ID of a flight mode given its ID or its label in flight_modes"""
+    if isinstance(mode, str):
+        for key, label in flight_modes.items():
+            if label.lower() == mode.lower():
+                return key
+        raise ValueError('unknown flight mode {}'.format(mode))
+    return int(mode)
@@ -9,85 +9,306 @@ FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
 You should have received a copy of the GNU General Public License along with
 this program. If not, see <http://www.gnu.org/licenses/>.
 """
-from typing import List, Dict, Union
+import os
+from typing import List, Dict, Union, Callable
 import numpy as np
 import pandas as pd
 from importlib.util import find_spec
 from enum import Enum
 
-from ardupilot_log_reader.reader import Ardupilot
-
-from flightdata.fields import Fields, CIDTypes
+from flightdata.fields import Fields, CIDTypes, DerivedField
 from flightdata.mapping import get_ardupilot_mapping
+from flightdata.store import write_store, read_store
+from flightdata.pyramid import Pyramid, lod_path
+from flightdata.quality import QualityIndex
+from flightdata.cache import LogCache
+from flightdata.profiling import StageTimer
+from flightdata.config.ardupilot import flight_modes, flight_mode_id
+
+
+# pyarrow parses csv files on several threads, it is used by from_csv when it is installed
+_CSV_ENGINE = dict(engine='pyarrow') if find_spec('pyarrow') is not None else {}
+
+# the ardupilot message types read by from_log
+LOG_MESSAGES = ['ARSP', 'BARO', 'GPS', 'RCIN', 'RCOU', 'IMU',
+                'BAT', 'BAT2', 'MODE', 'NKF1', 'NKF2', 'XKF1', 'XKF2', 'RPM', 'MAG']
+
+
+def log_messages(fields=None, skip_start: bool = True) -> List[str]:
+    """The message types from_log needs to read fields, worked out from the io names of the
+    mappings in ./mapping. The EKF type is not known until the log has been read, so the
+    messages of both EKF mappings are included, only one of them will be in the log.
+
+    Args:
+        fields (Field or List[Field], optional): the fields wanted. Defaults to all of them.
+        skip_start (bool, optional): include the magnetometer, which skip_start needs. Defaults to True.
+
+    Returns:
+        List[str]: message types, in the order of LOG_MESSAGES
+    """
+    if fields is None:
+        return LOG_MESSAGES
+    fields = fields if isinstance(fields, list) else [fields]
+    names = set(Fields.some_names([Fields.TIME] + fields + ([Fields.MAGNETOMETER] if skip_start else [])))
+    types = set()
+    for ekf_type in [2, 3]:
+        io_info = get_ardupilot_mapping(ekf_type)
+        for io_name, base_name in zip(io_info.io_names, io_info.base_names):
+            # io names are the message type followed by the message field, eg BAT2Volt
+            matches = [mtype for mtype in LOG_MESSAGES if io_name.startswith(mtype)]
+            if base_name in names and len(matches) > 0:
+                types.add(max(matches, key=len))
+    return [mtype for mtype in LOG_MESSAGES if mtype in types]
+
+
+def nearest_rows(index: np.ndarray, times) -> np.ndarray:
+    """row ids of the index values closest to times, by binary search over the sorted index"""
+    right = np.clip(np.searchsorted(index, times), 1, len(index) - 1)
+    left = right - 1
+    return np.where(np.abs(times - index[left]) <= np.abs(index[right] - times), left, right)
+
+
+def resample(index: np.ndarray, values: np.ndarray, times, method: str = 'nearest') -> np.ndarray:
+    """Sample the (N, k) values recorded at the sorted index at the M times, see Flight.read_times
+
+    Returns:
+        np.ndarray: (M, k) array
+    """
+    times = np.asarray(times, dtype=float)
+    if method == 'nearest':
+        return values[nearest_rows(index, times)]
+    elif method == 'previous':
+        return values[np.clip(np.searchsorted(index, times, side='right') - 1, 0, len(index) - 1)]
+    elif method == 'linear':
+        values = values.astype(float)
+        output = np.full((len(times), values.shape[1]), np.nan)
+        for i in range(values.shape[1]):
+            valid = ~np.isnan(values[:, i])
+            if np.any(valid):
+                output[:, i] = np.interp(times, index[valid], values[valid, i], left=np.nan, right=np.nan)
+        return output
+    else:
+        raise ValueError('unknown method {}'.format(method))
 
 
 class Flight(object):
     def __init__(self, data, parameters: List = None, zero_time_offset: float = 0):
         self.data = data
         self.parameters = parameters
-        self.zero_time = self.data.index[0] + zero_time_offset
-        self.data.index = self.data.index - self.data.index[0]
+        if len(self.data) > 0:
+            self.zero_time = self.data.index[0] + zero_time_offset
+            self.data.index = self.data.index - self.data.index[0]
+        else:
+            self.zero_time = zero_time_offset
+        self._cache = {}  # values derived from the data, built on first use
+        self._cache_depends = {}  # the column names each cached value was built from
 
     def to_csv(self, filename):
         self.data.to_csv(filename)
     
     @staticmethod
-    def from_csv(filename):
-        data = pd.read_csv(filename)
+    def from_csv(filename, fields=None, compact=False):
+        """Read a csv written by Flight.to_csv.
+
+        Args:
+            filename (str): path to the csv
+            fields (Field or List[Field], optional): only read the columns of these fields, TIME is
+                always read and requested columns that are not in the file are NaN. Defaults to all columns.
+            compact (bool, optional): hold the fields in their storage dtypes, see compact(). Defaults to False.
+
+        Returns:
+            Flight
+        """
+        header = pd.read_csv(filename, nrows=0).columns.to_list()
+        if fields is None:
+            names = header
+        else:
+            names = list(dict.fromkeys(Fields.TIME.names + Fields.some_names(fields)))
+        usecols = [name for name in names if name in header]
+
+        # parse the field columns straight to floats rather than inferring their types,
+        # floats are parsed in their storage dtype when compacting, the rest are converted by compact()
+        storage = Fields.dtypes()
+        dtype = {
+            name: storage[name] if compact and storage[name] in ('float32', 'float64') else 'float64'
+            for name in usecols if name in storage
+        }
+        data = pd.read_csv(filename, usecols=usecols, dtype=dtype, **_CSV_ENGINE)
+        if fields is not None:
+            data = data.reindex(columns=names)
         data.index = data[Fields.TIME.names[0]].copy()
         data.index.name = 'time_index'
 
-        return Flight(data)
+        flight = Flight(data)
+        return flight.compact() if compact else flight
+
+    def to_store(self, filename, lod: bool = False):
+        """Save to the columnar binary store, see ./store.py
+
+        Args:
+            filename (str): path to the store
+            lod (bool, optional): also save the plotting pyramid (see pyramid()) next to the store,
+                otherwise a pyramid left by an earlier save is deleted. Defaults to False.
+        """
+        write_store(filename, self.data, dict(
+            zero_time=float(self.zero_time), parameters=self.parameters, quality=self.quality().to_dict()))
+        if lod:
+            self.pyramid().save(lod_path(filename))
+        elif os.path.exists(lod_path(filename)):
+            os.remove(lod_path(filename))
 
     @staticmethod
-    def from_log(log_path, skip_start=True):
+    def from_store(filename, mmap=True):
+        """Open a columnar binary store written by Flight.to_store.
+
+        Args:
+            filename (str): path to the store
+            mmap (bool, optional): memory map the columns so they are only read when accessed. Defaults to True.
+
+        Returns:
+            Flight
+        """
+        data, meta = read_store(filename, mmap)
+        flight = Flight(data, meta['parameters'], meta['zero_time'])
+        if 'quality' in meta:
+            flight._cached('quality', Fields.all(), lambda: QualityIndex.from_dict(meta['quality']))
+        if os.path.exists(lod_path(filename)):
+            flight._cached('pyramid', Fields.all(), lambda: Pyramid.load(lod_path(filename), flight.data, mmap))
+        return flight
+
+    @staticmethod
+    def from_log(log_path, skip_start=True, cache: LogCache = None, compact=False, profile=None, fields=None):
         """Constructor from an ardupilot bin file.
             fields are renamed and units converted to the tool fields defined in ./fields.py
             The input fields, read from the log are specified in ./mapping 
 
             Args:
                 log_path (str): [description]
+                skip_start (bool): drop the data before the magnetometer has initialised
+                cache (LogCache, optional): a cache of parsed logs, see ./cache.py. A repeat load
+                    of the same log is read from the cache rather than parsed, into writable arrays.
+                compact (bool): hold the fields in their storage dtypes, see Flight.compact
+                profile (bool, Callable or StageTimer, optional): record the wall time and rows of each
+                    stage of the load, see ./profiling.py. True keeps the records on the stages attribute
+                    of the returned Flight, a callable is also called with each record. Pass a
+                    StageTimer(trace_memory=True) to also record memory.
+                fields (Field or List[Field], optional): only read the messages these fields are mapped
+                    from (see log_messages), the Flight holds TIME and these fields. Defaults to all fields.
 
             Returns:
                 Flight
         """
-        _field_request = ['ARSP', 'BARO', 'GPS', 'RCIN', 'RCOU', 'IMU',
-                        'BAT', 'BAT2', 'MODE', 'NKF1', 'NKF2', 'XKF1', 'XKF2', 'RPM', 'MAG']
-        _parser = Ardupilot(log_path, types=_field_request, zero_time_base=True)
-        fulldf = _parser.join_logs(_field_request)
+        timer = StageTimer.create(profile)
+        with timer:
+            if cache is None:
+                flight = Flight._parse_log(log_path, skip_start, timer, fields)
+            else:
+                with timer.stage('cache_lookup'):
+                    key = cache.key(log_path, skip_start, fields)
+                    cached = cache.get(key)
+                if cached is not None:
+                    with timer.stage('cache_read') as record:
+                        # read rather than mapped, so the data is writable as it is on a miss
+                        flight = Flight.from_store(cached, mmap=False)
+                        record.rows = len(flight.data)
+                else:
+                    flight = Flight._parse_log(log_path, skip_start, timer, fields)
+                    with timer.stage('cache_write'):
+                        cache.put(key, flight)
+            if compact:
+                with timer.stage('compact') as record:
+                    flight = flight.compact()
+                    record.rows = len(flight.data)
+        if timer.enabled:
+            flight.stages = timer.records
+        return flight
 
-        ardupilot_io_info = get_ardupilot_mapping(_parser.parms['AHRS_EKF_TYPE'])
+    @staticmethod
+    def _parse_log(log_path, skip_start, timer: StageTimer, fields=None):
+        # the log reader pulls in pymavlink, so it is only imported when a log is read
+        from ardupilot_log_reader.reader import Ardupilot
 
-        # expand the dataframe to include all the columns listed in the io_info instance
-        input_data = fulldf.get(list(set(fulldf.columns.to_list())
-                                    & set(ardupilot_io_info.io_names)))
+        messages = log_messages(fields, skip_start)
+        with timer.stage('parse'):
+            _parser = Ardupilot(log_path, types=messages, zero_time_base=True)
 
-        # Generate a reordered io instance to match the columns in the dataframe
-        _fewer_io_info = ardupilot_io_info.subset(input_data.columns.to_list())
+        with timer.stage('join_logs') as record:
+            fulldf = _parser.join_logs(messages)
+            record.rows = len(fulldf)
 
-        _data = input_data * _fewer_io_info.factors_to_base  # do the unit conversion
-        _data.columns = _fewer_io_info.base_names  # rename the columns
+        ardupilot_io_info = get_ardupilot_mapping(_parser.parms['AHRS_EKF_TYPE'])
 
-        # add the missing tool columns
-        missing_cols = pd.DataFrame(
-            columns=list(set(Fields.all_names()) -
-                        set(_data.columns.to_list())) + [Fields.TIME.names[0]]
-        )
-        output_data = _data.merge(
-            missing_cols, on=Fields.TIME.names[0], how='left')
+        _data = ardupilot_io_info.convert(fulldf, timer)
 
-        #find the time 3 seconds after the magnetometer has initialised
-        if skip_start:
-            first_good_time = output_data.loc[pd.isna(output_data['magnetometer_0']) == False].loc[output_data['magnetometer_0'] != 0].iloc[0].time_flight + 3
-        else:
-            first_good_time = output_data.iloc[0].time_flight
-        #TODO add a check for GPS Sat count here perhaps
+        with timer.stage('missing_columns') as record:
+            if fields is None:
+                names = Fields.all_names()
+            else:
+                names = list(dict.fromkeys(Fields.some_names(
+                    [Fields.TIME] + (fields if isinstance(fields, list) else [fields]))))
+            output_data = Flight._add_missing_columns(_data, names + (Fields.MAGNETOMETER.names if skip_start else []))
+            record.rows = len(output_data)
+
+        with timer.stage('skip_start') as record:
+            if skip_start:
+                first_good_time = Flight._magnetometer_start(output_data)
+            else:
+                first_good_time = output_data.iloc[0].time_flight
+            output_data = output_data.loc[first_good_time:]
+            if fields is not None:
+                output_data = output_data[names]
+            record.rows = len(output_data)
+
+        flight = Flight(output_data, _parser.parms)
+        with timer.stage('quality') as record:
+            # low satellite counts, dropouts and time jumps, see ./quality.py
+            flight.quality()
+            record.rows = len(output_data)
+        return flight
 
-        # set the first time in the index to 0
-        output_data.index = _data[Fields.TIME.names[0]].copy()
+    @staticmethod
+    def _add_missing_columns(data, names: List[str] = None):
+        """add the missing tool columns (names, defaults to all of them) and index by time,
+        the columns that are not in names are dropped"""
+        names = Fields.all_names() if names is None else names
+        output_data = data.reindex(
+            columns=[name for name in data.columns.to_list() if name in names] +
+            [name for name in names if name not in data.columns])
+        output_data.index = data[Fields.TIME.names[0]].to_numpy()
         output_data.index.name = 'time_index'
+        return output_data
+
+    @staticmethod
+    def _magnetometer_start(data):
+        """find the time 3 seconds after the magnetometer has initialised, None if it has not"""
+        magnetometer = data['magnetometer_0']
+        started = data.loc[pd.notna(magnetometer) & (magnetometer != 0)]
+        if len(started) == 0:
+            return None
+        return started.iloc[0].time_flight + 3
+
+    def compact(self):
+        """Return a new Flight with each field held in its storage dtype (Field.dtype in ./fields.py).
+        Sensors become float32, PWM values and satellite counts nullable integers and the flight
+        mode columns categoricals of the mode IDs (labels in config.ardupilot.flight_modes).
+        Columns that are not part of a field are left alone.
+        """
+        dtypes = Fields.dtypes()
+        columns = {}
+        for name in self.data.columns:
+            dtype = dtypes.get(name)
+            column = self.data[name]
+            if dtype is None or column.dtype == dtype:
+                columns[name] = column
+            elif pd.api.types.is_integer_dtype(dtype):
+                columns[name] = column.round().astype(dtype)
+            else:
+                columns[name] = column.astype(dtype)
 
-        return Flight(output_data.loc[first_good_time:], _parser.parms)
+        return Flight(
+            data=pd.DataFrame(columns, index=self.data.index.copy()),
+            parameters=self.parameters,
+            zero_time_offset=self.zero_time)
 
     @property
     def duration(self):
@@ -103,14 +324,78 @@ class Flight(object):
         :param time: desired time in microseconds
         :return: dict[column names, values]
         """
-        return self.read_row_by_id(names, self.data.index.get_loc(time, method='nearest'))
+        return self.read_row_by_id(names, int(self._nearest_rows(time)))
+
+    def _nearest_rows(self, times):
+        return nearest_rows(self.data.index.to_numpy(), times)
+
+    def read_times(self, fields, times, method: str = 'nearest') -> np.ndarray:
+        """Read the requested fields at many times at once.
+
+        Args:
+            fields (Field or List[Field]): the fields to read
+            times (array like): the M times to read, seconds from the start of the flight
+            method (str, optional): how to pick values between samples. Defaults to 'nearest'.
+                nearest: the row closest in time, as read_closest.
+                previous: the last row at or before the time (the first row for earlier times).
+                linear: interpolate each column between its valid (non NaN) samples,
+                    NaN outside the range of those samples.
+
+        Returns:
+            np.ndarray: (M, k) array, one column per name in the fields
+        """
+        return resample(self.data.index.to_numpy(), self.read_fields(fields).to_numpy(), times, method)
 
     @property
     def column_names(self):
         return self.data.columns.to_list()
 
     def read_fields(self, fields):
-        return self.data[Fields.some_names(fields)]
+        """the columns of the fields, derived fields (./derived.py) are computed on first use and cached"""
+        _fields = fields if isinstance(fields, list) else [fields]
+        if not any(isinstance(field, DerivedField) for field in _fields):
+            return self.data[Fields.some_names(fields)]
+        return pd.concat([
+            pd.DataFrame(self._derived_values(field), index=self.data.index, columns=field.names)
+            if isinstance(field, DerivedField) else self.data[field.names]
+            for field in _fields
+        ], axis=1)
+
+    def _derived_values(self, field: DerivedField) -> np.ndarray:
+        def _build():
+            # a log is read into rows from different messages (WIND from XKF2 rows, ATTITUDE from
+            # XKF1 rows), so each field is held at its last logged value to line them up
+            values = field.compute(*[
+                self._derived_values(depend) if isinstance(depend, DerivedField)
+                else self.data[depend.names].astype(float).ffill().to_numpy()
+                for depend in field.depends
+            ])
+            values.setflags(write=False)
+            return values
+        return self._cached(('derived', field.name), field.base_fields(), _build)
+
+    def _cached(self, key, fields, build: Callable):
+        """the value cached under key, built by build() on first use.
+        fields are the fields it is built from, invalidate() drops it when they change."""
+        if key not in self._cache:
+            self._cache[key] = build()
+            self._cache_depends[key] = set(Fields.some_names(fields))
+        return self._cache[key]
+
+    def invalidate(self, fields=None):
+        """Drop the cached values built from fields, call it after modifying their columns.
+
+        Args:
+            fields (Field or List[Field], optional): the fields that changed. Defaults to all of them.
+        """
+        if fields is None:
+            self._cache.clear()
+            self._cache_depends.clear()
+            return
+        names = set(Fields.some_names(fields))
+        for key in [key for key, depends in self._cache_depends.items() if depends & names]:
+            del self._cache[key]
+            del self._cache_depends[key]
 
     def read_numpy(self, fields):
         return self.read_fields(fields).to_numpy().T
@@ -136,6 +421,10 @@ class Flight(object):
             'longitude': firstgps.global_position_longitude
         }
 
+    def _window(self):
+        """the flight that owns the data and the rows of it this flight covers"""
+        return self, 0, len(self.data)
+
     def subset(self, start_time: float, end_time: float):
         """generate a subset between the specified times
 
@@ -144,28 +433,82 @@ class Flight(object):
             end_time (float): end of the subset, -1 for the end of the flight
 
         Returns:
-            Flight: a new instance of Flight contianing a refernce to the subset. parameters referenced, 
+            FlightView: a view of the rows of this flight, no data is copied. parameters referenced, 
             index adjusted so 0 is the start of the subset.
         """
+        parent, start, stop = self._window()
+        # a view of a view is a view of the original data, so the search is over the parent index
+        index = parent.data.index.to_numpy()[start:stop]
+
+        first = 0 if start_time == 0 else int(nearest_rows(index, start_time + index[0]))
+        last = len(index) if end_time == -1 else int(nearest_rows(index, end_time + index[0]))
+
+        return FlightView(parent, start + first, start + last)
+
+    def pyramid(self) -> Pyramid:
+        """The min, max and mean of every field column at power of two decimations, for plotting
+        long flights. Built once and cached, or read from the file saved by to_store(lod=True).
+        See ./pyramid.py, query it with pyramid().query(start_time, end_time, width).
+        """
+        return self._cached('pyramid', Fields.all(), lambda: Pyramid.build(self.data))
 
-        if start_time == 0 and end_time == -1:
-            new_data = self.data
-        elif start_time == 0:
-            end = self.data.index.get_loc(end_time, method='nearest')
-            new_data = self.data.iloc[:end]
-        elif end_time == -1:
-            start = self.data.index.get_loc(start_time, method='nearest')
-            new_data = self.data.iloc[start:]
+    def quality(self) -> QualityIndex:
+        """The valid, low quality and missing spans of each field, see ./quality.py. Built when a log
+        is read and saved with the store, otherwise built on first use. A subset takes the spans of
+        the flight it was cut from.
+        """
+        def _build():
+            parent, start, stop = self._window()
+            if parent is self or stop <= start:
+                return QualityIndex.build(self.data)
+            index = parent.data.index
+            return parent.quality().window(index[start], index[stop - 1])
+        return self._cached('quality', Fields.all(), _build)
+
+    def mode_segments(self) -> pd.DataFrame:
+        """The runs of constant flight mode, built once and cached.
+
+        Returns:
+            pd.DataFrame: one row per run with the mode ID, its label (config.ardupilot.flight_modes),
+                the start and stop row offsets (stop exclusive) and the start and end times.
+        """
+        return self._cached('mode_segments', Fields.FLIGHTMODE, self._build_mode_segments)[0]
+
+    def _build_mode_segments(self):
+        # the mode is only logged when it changes, so fill it over the rows in between
+        modes = self.data[Fields.FLIGHTMODE.names[0]].astype(float).ffill().bfill().to_numpy()
+        index = self.data.index.to_numpy()
+        if len(modes) == 0 or np.isnan(modes[0]):
+            # no mode was logged, after filling the column is either all NaN or has no NaN
+            starts, stops = np.empty(0, dtype=int), np.empty(0, dtype=int)
         else:
-            start = self.data.index.get_loc(start_time, method='nearest')
-            end = self.data.index.get_loc(end_time, method='nearest')
-            new_data = self.data.iloc[start:end]
+            changes = np.flatnonzero(modes[1:] != modes[:-1]) + 1
+            starts = np.concatenate([[0], changes]).astype(int)
+            stops = np.concatenate([changes, [len(modes)]]).astype(int)
+        segments = pd.DataFrame(dict(
+            mode=modes[starts],
+            label=[flight_modes.get(mode, str(mode)) for mode in modes[starts]],
+            start=starts,
+            stop=stops,
+            start_time=index[starts],
+            end_time=index[stops - 1]
+        ))
+        runs = {mode: group[['start', 'stop']].to_numpy() for mode, group in segments.groupby('mode')}
+        return segments, runs
+
+    def mode_subsets(self, mode) -> List['FlightView']:
+        """Zero copy views of all the runs of a flight mode.
 
-        return Flight(
-            data=new_data,
-            parameters=self.parameters,
-            zero_time_offset=self.zero_time
-        )
+        Args:
+            mode (int or str): the mode ID or its label in config.ardupilot.flight_modes
+
+        Returns:
+            List[FlightView]: one per run, in time order
+        """
+        _, runs = self._cached('mode_segments', Fields.FLIGHTMODE, self._build_mode_segments)
+        parent, offset, _ = self._window()
+        runs = runs.get(flight_mode_id(mode), [])
+        return [FlightView(parent, offset + start, offset + stop) for start, stop in runs]
 
     def transform(self, transforms):
         '''Return a new Flight class transformed by the dict of functions passed.
@@ -187,3 +530,78 @@ class Flight(object):
             data=df.set_index(Fields.TIME.names[0]),
             parameters=self.parameters,
             zero_time_offset=self.zero_time)
+
+    def transform_arrays(self, transforms: Dict[int, Callable]):
+        '''Return a new Flight class transformed by the dict of vectorized functions passed.
+        Each key represents an ID from CIDTypes, each value a function that takes the (N, length)
+        array of a field and returns the transformed (N, length) array. Types missing from the
+        dict, the fields the flight does not have and columns that are not part of a field are
+        passed through unchanged. See ./transform.py for the built in handlers.
+        '''
+        data = self.data.copy()
+        for field in Fields.all():
+            transform = transforms.get(field.cid_type)
+            present = [name for name in field.names if name in data.columns]
+            if transform is None or len(present) == 0:
+                continue
+            # a field the flight only has some columns of is transformed with nan in the others
+            values = transform(self.data.reindex(columns=field.names).to_numpy(dtype=float))
+            for i, name in enumerate(field.names):
+                if name in present:
+                    data[name] = values[:, i]
+
+        return Flight(data=data, parameters=self.parameters, zero_time_offset=self.zero_time)
+
+
+def _read_only(data: pd.DataFrame) -> pd.DataFrame:
+    """mark the arrays behind each block of data read only, writes then raise ValueError"""
+    for block in data._mgr.blocks:
+        values = block.values
+        # nullable integers keep their values and mask, categoricals their codes, in numpy arrays
+        for array in (values, getattr(values, '_data', None), getattr(values, '_mask', None),
+                      getattr(values, '_ndarray', None)):
+            if isinstance(array, np.ndarray):
+                array.flags.writeable = False
+    return data
+
+
+class FlightView(Flight):
+    """A Flight over a window of the rows of a parent Flight. Creating one only records the row
+    offsets and the time shift, the data is a view of the parent's arrays built on first access.
+    The arrays are shared with the parent so they are read only, writing to them raises ValueError.
+    Use copy() to get a Flight that can be modified, or assign a new frame to data, which
+    detaches the view from the parent.
+    """
+    def __init__(self, parent: Flight, start: int, stop: int):
+        self.parent = parent
+        self.start = start
+        self.stop = stop
+        self.parameters = parent.parameters
+        self.zero_time = parent.zero_time + (parent.data.index[start] if stop > start else 0)
+        self._data = None
+        self._detached = False
+        self._cache = {}
+        self._cache_depends = {}
+
+    @property
+    def data(self) -> pd.DataFrame:
+        if self._data is None:
+            data = self.parent.data.iloc[self.start:self.stop]
+            if len(data) > 0:
+                data.index = data.index - data.index[0]
+            self._data = _read_only(data)
+        return self._data
+
+    @data.setter
+    def data(self, data: pd.DataFrame):
+        # replacing the data detaches the view from the parent
+        self._data = data
+        self._detached = True
+
+    def _window(self):
+        if self._detached:
+            return self, 0, len(self._data)
+        return self.parent, self.start, self.stop
+
+    def copy(self) -> Flight:
+        return Flight(self.data.copy(), self.parameters, self.zero_time)
@@ -0,0 +1,83 @@
+"""
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+
+Channels computed from the logged fields. Read them like any other field:
+
+    flight.read_fields([Fields.POSITION, DerivedFields.ENERGY])
+
+they are computed for the whole flight on first use and cached on it,
+Flight.invalidate drops them when the fields they depend on change.
+"""
+
+import numpy as np
+
+from flightdata.fields import Fields, DerivedField, CIDTypes, _derived_list
+
+
+GRAVITY = 9.80665  # m/s/s
+
+
+def ned_to_body(attitude: np.ndarray, ned: np.ndarray) -> np.ndarray:
+    """rotate (N, 3) north, east, down vectors into the body frame given (N, 3) roll, pitch, yaw (radians)"""
+    sr, sp, sy = np.sin(attitude.T)
+    cr, cp, cy = np.cos(attitude.T)
+    n, e, d = ned.T
+    return np.column_stack([
+        cp * cy * n + cp * sy * e - sp * d,
+        (sr * sp * cy - cr * sy) * n + (sr * sp * sy + cr * cy) * e + sr * cp * d,
+        (cr * sp * cy + sr * sy) * n + (cr * sp * sy - sr * cy) * e + cr * cp * d
+    ])
+
+
+def _air_velocity(attitude: np.ndarray, velocity: np.ndarray, wind: np.ndarray) -> np.ndarray:
+    air = velocity.copy()
+    air[:, :2] -= wind
+    return ned_to_body(attitude, air)
+
+
+def _energy(position: np.ndarray, velocity: np.ndarray) -> np.ndarray:
+    potential = -GRAVITY * position[:, 2]
+    kinetic = 0.5 * np.sum(velocity ** 2, axis=1)
+    return np.column_stack([potential, kinetic, potential + kinetic])
+
+
+def _load_factor(acceleration: np.ndarray) -> np.ndarray:
+    return -acceleration[:, 2:] / GRAVITY
+
+
+def _air_angles(air_velocity: np.ndarray) -> np.ndarray:
+    u, v, w = air_velocity.T
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.column_stack([np.arctan2(w, u), np.arcsin(v / np.linalg.norm(air_velocity, axis=1))])
+
+
+class DerivedFields(object):
+    """The registry of derived fields. Do not instantiate.
+    """
+    BODYVELOCITY = DerivedField('body_velocity', 'meter / second', 3,
+                                [Fields.ATTITUDE, Fields.VELOCITY], ned_to_body, CIDTypes.BODY,
+                                description='ground velocity in the body frame', names=['u', 'v', 'w'])
+    AIRVELOCITY = DerivedField('air_velocity', 'meter / second', 3,
+                               [Fields.ATTITUDE, Fields.VELOCITY, Fields.WIND], _air_velocity, CIDTypes.BODY,
+                               description='velocity relative to the ekf wind estimate in the body frame',
+                               names=['u', 'v', 'w'])
+    ENERGY = DerivedField('energy', 'joule / kilogram', 3,
+                          [Fields.POSITION, Fields.VELOCITY], _energy,
+                          description='specific energy, potential above the origin and kinetic from the ground velocity',
+                          names=['potential', 'kinetic', 'total'])
+    LOADFACTOR = DerivedField('load_factor', 1, 1, [Fields.ACCELERATION], _load_factor,
+                              description='body z accelerometer over g, 1 in level flight')
+    AIRANGLES = DerivedField('air_angles', 'radian', 2, [AIRVELOCITY], _air_angles,
+                             description='estimated angle of attack and sideslip', names=['alpha', 'beta'])
+
+    @staticmethod
+    def all():
+        return _derived_list
@@ -11,12 +11,21 @@ this program. If not, see <http://www.gnu.org/licenses/>.
 """
 
 
-from pint import UnitRegistry, DimensionalityError
-from typing import Dict, List
-ureg = UnitRegistry()
+from typing import Callable, Dict, List, Union
+import numpy as np
+from flightdata.profiling import StageTimer, NullTimer
+from flightdata.units import registry
+
+
+def __getattr__(name):
+    # the registry used to be created here at import, ureg is kept for code that imports it
+    if name == 'ureg':
+        return registry()
+    raise AttributeError("module {} has no attribute {}".format(__name__, name))
 
 
 _field_list = []
+_derived_list = []
 
 
 class CIDTypes():
@@ -30,15 +39,25 @@ class CIDTypes():
 
 
 class Field(object):
-    def __init__(self, name: str, unit: ureg.Unit, length: int, cid_type: int = 3, description: str = '', names: List[str] = []):
+    def __init__(self, name: str, unit: Union[str, float], length: int, cid_type: int = 3, description: str = '', names: List[str] = [], dtype: str = 'float32'):
         self.name = name
-        self.unit = unit
+        self._unit = unit  # a pint unit expression, or a number for dimensionless fields
         self.length = length
         self.cid_type = cid_type
         self.description = description
+        self.dtype = dtype  # the storage dtype used by Flight.compact
         self.names = Field._make_names(self.name, names, length)
+        self._register()
+
+    def _register(self):
         _field_list.append(self)
 
+    @property
+    def unit(self):
+        if isinstance(self._unit, str):
+            return registry().Unit(self._unit)
+        return self._unit
+
     @staticmethod
     def _make_names(name, names, length):
         _out_names = []
@@ -53,39 +72,39 @@ class Field(object):
 class Fields(object):
     """This class defines the fields. Do not instantiate.
     """
-    TIME = Field('time', ureg.second, 2, CIDTypes.NA,
-                 names=['flight', 'actual'])
-    TXCONTROLS = Field('tx_controls', ureg.second, 8, CIDTypes.NA,
-                       description='PWM Values coming from the TX')
-    SERVOS = Field('servos', ureg.second, 8, CIDTypes.NA,
-                   description='PWN Values going to the Servos')
+    TIME = Field('time', 'second', 2, CIDTypes.NA,
+                 names=['flight', 'actual'], dtype='float64')
+    TXCONTROLS = Field('tx_controls', 'second', 8, CIDTypes.NA,
+                       description='PWM Values coming from the TX', dtype='UInt16')
+    SERVOS = Field('servos', 'second', 8, CIDTypes.NA,
+                   description='PWN Values going to the Servos', dtype='UInt16')
     FLIGHTMODE = Field('mode', 1, 3, CIDTypes.NA,
-                       description='The active flight mode ID')
-    POSITION = Field('position', ureg.meter, 3, CIDTypes.CARTESIAN,
+                       description='The active flight mode ID', dtype='category')
+    POSITION = Field('position', 'meter', 3, CIDTypes.CARTESIAN,
                      description='position of plane (n, e, d)', names=['x', 'y', 'z'])
-    GLOBALPOSITION = Field('global_position', ureg.degree,
-                           2, CIDTypes.GPS, names=['latitude', 'longitude'])
+    GLOBALPOSITION = Field('global_position', 'degree',
+                           2, CIDTypes.GPS, names=['latitude', 'longitude'], dtype='float64')
     GPSSATCOUNT = Field('gps_sat_count', 1, 1, CIDTypes.NA,
-                        description='number of satellites')
-    SENSORALTITUDE = Field('altitude', ureg.meters, 2,
+                        description='number of satellites', dtype='UInt8')
+    SENSORALTITUDE = Field('altitude', 'meter', 2,
                            CIDTypes.ZONLY, names=['gps', 'baro'])
-    ATTITUDE = Field('attitude', ureg.radian, 3, CIDTypes.EULER,
+    ATTITUDE = Field('attitude', 'radian', 3, CIDTypes.EULER,
                      description='euler angles, order = yaw, pitch, roll', names=['roll', 'pitch', 'yaw'])
-    AXISRATE = Field('axis_rate', ureg.radian / ureg.second, 3, CIDTypes.BODY,
+    AXISRATE = Field('axis_rate', 'radian / second', 3, CIDTypes.BODY,
                      description='rotational velocities', names=['roll', 'pitch', 'yaw'])
-    BATTERY = Field('battery', ureg.volt, 2, CIDTypes.NA,
+    BATTERY = Field('battery', 'volt', 2, CIDTypes.NA,
                     description='battery voltages')
-    CURRENT = Field('current', ureg.amp, 4, CIDTypes.NA,
+    CURRENT = Field('current', 'ampere', 4, CIDTypes.NA,
                     description='motor currents')
-    AIRSPEED = Field('airspeed', ureg.meter / ureg.second,
+    AIRSPEED = Field('airspeed', 'meter / second',
                      2, CIDTypes.NA, description='sensor airspeed')
-    ACCELERATION = Field('acceleration', ureg.meter / ureg.second / ureg.second,
+    ACCELERATION = Field('acceleration', 'meter / second ** 2',
                          3, CIDTypes.CARTESIAN, description='accelerations (earth frame)', names=['x', 'y', 'z'])
-    VELOCITY = Field('velocity', ureg.meter / ureg.second, 3, CIDTypes.CARTESIAN,
+    VELOCITY = Field('velocity', 'meter / second', 3, CIDTypes.CARTESIAN,
                      description='velocity data (earth frame)', names=['x', 'y', 'z'])
-    WIND = Field('wind', ureg.meter / ureg.second, 2, CIDTypes.XY,
+    WIND = Field('wind', 'meter / second', 2, CIDTypes.XY,
                  description='wind in earth frame', names=['x', 'y'])
-    RPM = Field('rpm', 1 / ureg.minute, 2, CIDTypes.NA,
+    RPM = Field('rpm', '1 / minute', 2, CIDTypes.NA,
                 description='motor rpm')
     MAGNETOMETER = Field('magnetometer', 1, 3, CIDTypes.CARTESIAN, description='mag field strength n, e, d')
     
@@ -100,6 +119,11 @@ class Fields(object):
             _all_names += field.names
         return _all_names
 
+    @staticmethod
+    def dtypes() -> Dict[str, str]:
+        """the storage dtype of each column name"""
+        return {name: field.dtype for field in _field_list for name in field.names}
+
     @staticmethod
     def some_names(fields):
         if isinstance(fields, list):
@@ -117,6 +141,34 @@ class Fields(object):
         return outdict
 
 
+class DerivedField(Field):
+    """A field computed from other fields rather than read from a log. Derived fields are not columns
+    of the data, Flight.read_fields computes them on first use and caches them, see ./derived.py.
+
+    Args:
+        depends (List[Field]): the fields the values are computed from, native or derived
+        compute (Callable): takes the (N, length) float array of each dependency, in order,
+            and returns the (N, length) array of this field
+    """
+    def __init__(self, name: str, unit: Union[str, float], length: int, depends: List[Field], compute: Callable,
+                 cid_type: int = CIDTypes.NA, description: str = '', names: List[str] = []):
+        self.depends = depends
+        self.compute = compute
+        super().__init__(name, unit, length, cid_type, description, names, dtype='float64')
+
+    def _register(self):
+        _derived_list.append(self)
+
+    def base_fields(self) -> List[Field]:
+        """the logged fields this field is computed from, directly or through other derived fields"""
+        _base_fields = []
+        for field in self.depends:
+            for base in field.base_fields() if isinstance(field, DerivedField) else [field]:
+                if base not in _base_fields:
+                    _base_fields.append(base)
+        return _base_fields
+
+
 # TODO This needs an alternate source field if required info is not there
 class MappedField(object):
     def __init__(self, field, position, name, unit):
@@ -146,6 +198,7 @@ class MappedField(object):
     @property
     def base_factor(self):
         if not self._base_factor:
+            from pint import DimensionalityError
             try:
                 self._base_factor = float(self.unit) / float(self.field.unit)
             except DimensionalityError:
@@ -155,19 +208,30 @@ class MappedField(object):
 
 
 class FieldIOInfo(object):
+    """The mapping from the columns of a log to the tool fields, held as a table of io names,
+    base names and numpy vectors of the unit conversion factors.
+    Build one from MappedFields, or from a compiled table with from_table (see ./mapping/compiler.py).
+    """
     def __init__(self, field_maps: Dict[str, MappedField]):
-        self._field_maps = field_maps
+        self._set_table(
+            list(field_maps.keys()),
+            [value.field.names[value.position] for value in field_maps.values()],
+            [value.base_factor for value in field_maps.values()]
+        )
 
-        self._io_names = []
-        self._base_names = []
-        self._factors_to_base = []
-        self._factors_to_field = []
+    @staticmethod
+    def from_table(io_names: List[str], base_names: List[str], factors_to_base) -> 'FieldIOInfo':
+        """a FieldIOInfo from precomputed factors, no unit conversions are worked out"""
+        io_info = FieldIOInfo.__new__(FieldIOInfo)
+        io_info._set_table(io_names, base_names, factors_to_base)
+        return io_info
 
-        for key, value in self._field_maps.items():
-            self._io_names.append(key)
-            self._base_names.append(value.field.names[value.position])
-            self._factors_to_base.append(value.base_factor)
-            self._factors_to_field.append(1 / value.base_factor)
+    def _set_table(self, io_names: List[str], base_names: List[str], factors_to_base):
+        self._io_names = list(io_names)
+        self._base_names = list(base_names)
+        self._factors_to_base = np.asarray(factors_to_base, dtype=float)
+        self._factors_to_field = 1 / self._factors_to_base
+        self._positions = {name: i for i, name in enumerate(self._io_names)}
 
     @property
     def io_names(self):
@@ -178,12 +242,36 @@ class FieldIOInfo(object):
         return self._base_names
 
     @property
-    def factors_to_base(self) -> List[float]:
+    def factors_to_base(self) -> np.ndarray:
         return self._factors_to_base
 
     @property
-    def factors_to_field(self) -> List[float]:
+    def factors_to_field(self) -> np.ndarray:
         return self._factors_to_field
 
+    def convert(self, data, timer: StageTimer = None):
+        """rename the mapped columns of a log dataframe to the tool names and convert them to base units.
+        columns that are not mapped are dropped. Each step is recorded as a stage on timer, see ./profiling.py.
+        """
+        timer = NullTimer() if timer is None else timer
+
+        with timer.stage('column_intersection') as record:
+            # expand the dataframe to include all the columns listed in the io_info instance
+            input_data = data.get(list(set(data.columns.to_list()) & set(self.io_names)))
+
+            # Generate a reordered io instance to match the columns in the dataframe
+            _fewer_io_info = self.subset(input_data.columns.to_list())
+            record.rows = len(input_data)
+
+        with timer.stage('unit_conversion') as record:
+            _data = input_data * _fewer_io_info.factors_to_base  # do the unit conversion
+            _data.columns = _fewer_io_info.base_names  # rename the columns
+            record.rows = len(_data)
+        return _data
+
     def subset(self, less_base_names):
-        return FieldIOInfo({x: self._field_maps[x] for x in less_base_names if x in self._field_maps})
+        positions = [self._positions[x] for x in less_base_names if x in self._positions]
+        return FieldIOInfo.from_table(
+            [self._io_names[i] for i in positions],
+            [self._base_names[i] for i in positions],
+            self._factors_to_base[positions])
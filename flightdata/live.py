@@ -0,0 +1,135 @@
+"""
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import threading
+from typing import Dict, Iterable, List
+import numpy as np
+import pandas as pd
+
+from flightdata.fields import Fields
+from flightdata.data import Flight
+from flightdata.mapping import get_ardupilot_mapping
+from flightdata.stream import LogStream
+
+
+class RingBuffer(object):
+    """A fixed capacity table of float columns, the oldest rows are overwritten once it is full.
+
+    Args:
+        names (List[str]): the column names
+        capacity (int): the number of rows kept
+    """
+    def __init__(self, names: List[str], capacity: int):
+        self.names = names
+        self.capacity = capacity
+        self._values = np.full((capacity, len(names)), np.nan)
+        self._next = 0  # the row the next append writes to
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._count
+
+    def append(self, data: pd.DataFrame):
+        """add the rows of data, columns that are not in the buffer are ignored, missing ones are NaN"""
+        values = data.reindex(columns=self.names).to_numpy(dtype=float)[-self.capacity:]
+        rows = (self._next + np.arange(len(values))) % self.capacity
+        with self._lock:
+            self._values[rows] = values
+            self._next = (self._next + len(values)) % self.capacity
+            self._count = min(self._count + len(values), self.capacity)
+
+    def snapshot(self) -> np.ndarray:
+        """a copy of the rows in the buffer, oldest first, consistent with respect to appends"""
+        with self._lock:
+            if self._count < self.capacity:
+                return self._values[:self._count].copy()
+            return np.concatenate([self._values[self._next:], self._values[:self._next]])
+
+
+class LiveFlight(object):
+    """Incremental ingestion of the raw rows of a log into a ring buffer of the tool fields.
+    Each batch is converted with the FieldIOInfo mapping for the log's EKF type, memory is bounded
+    by the capacity and snapshot() returns the current contents as a Flight.
+
+    Args:
+        capacity (int): number of rows to keep
+        parameters (Dict, optional): the log parameters, AHRS_EKF_TYPE selects the mapping.
+            Parameters read from the log by a LogStream source are used when they are not passed.
+    """
+    def __init__(self, capacity: int, parameters: Dict = None):
+        self.buffer = RingBuffer(Fields.all_names(), capacity)
+        self.parameters = {} if parameters is None else parameters
+        self._thread = None
+        self._stop = threading.Event()
+        self.error = None  # the exception that ended the background thread
+
+    def ingest(self, raw: pd.DataFrame):
+        """convert a batch of raw log rows (join_logs names) and append them"""
+        io_info = get_ardupilot_mapping(self.parameters['AHRS_EKF_TYPE'])
+        self.buffer.append(io_info.convert(raw))
+
+    def _raise(self):
+        if self.error is not None:
+            raise self.error
+
+    def snapshot(self) -> Flight:
+        """the rows in the buffer as a Flight, raises the error that stopped the background thread"""
+        self._raise()
+        values = self.buffer.snapshot()
+        data = pd.DataFrame(values, columns=self.buffer.names, copy=False)
+        data.index = pd.Index(data[Fields.TIME.names[0]].to_numpy(), name='time_index')
+        return Flight(data, dict(self.parameters))
+
+    def run(self, source: Iterable[pd.DataFrame]):
+        """ingest each batch from source until it is exhausted or stop() is called"""
+        for raw in source:
+            if self._stop.is_set():
+                break
+            self.ingest(raw)
+
+    def _run(self, source: Iterable[pd.DataFrame]):
+        try:
+            self.run(source)
+        except Exception as ex:
+            self.error = ex
+
+    def start(self, source: Iterable[pd.DataFrame]):
+        """run in a background thread, an exception ends it and is raised by snapshot, join or stop"""
+        self._thread = threading.Thread(target=self._run, args=(source,), daemon=True)
+        self._thread.start()
+
+    def join(self, timeout: float = None):
+        """wait for the background thread to exhaust its source"""
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._raise()
+
+    def stop(self):
+        self._stop.set()
+        self.join()
+
+    @staticmethod
+    def follow(log_path, capacity: int, poll: float = 1.0) -> 'LiveFlight':
+        """Start following a log that is being written, see LogStream.follow"""
+        stream = LogStream(log_path)
+        live = LiveFlight(capacity, stream.parameters)
+        live.start(stream.follow(poll, live._stop))
+        return live
+
+    @staticmethod
+    def replay(log_path, capacity: int, speed: float = 1.0, batch: float = 0.1) -> 'LiveFlight':
+        """Start replaying a finished log at the rate it was logged, see LogStream.replay"""
+        stream = LogStream(log_path)
+        live = LiveFlight(capacity, stream.parameters)
+        live.start(stream.replay(batch, speed))
+        return live
@@ -1,11 +1,20 @@
-from .ardupilot_ekfv2 import ardupilot_ekfv2_io_info
-from .ardupilot_ekfv3 import ardupilot_ekfv3_io_info
+import json
+import os
+
+from flightdata.fields import FieldIOInfo
+
+
+# the mapping tables compiled from ardufields.csv by ./compiler.py
+TABLES = os.path.join(os.path.dirname(__file__), 'ardupilot.json')
+
+_mappings = {}
 
 
 def get_ardupilot_mapping(ekfv):
-    if ekfv == 2:
-        return ardupilot_ekfv2_io_info
-    elif ekfv == 3:
-        return ardupilot_ekfv3_io_info
-    else:
+    if len(_mappings) == 0:
+        with open(TABLES) as f:
+            for ekf_type, table in json.load(f).items():
+                _mappings[int(ekf_type)] = FieldIOInfo.from_table(**table)
+    if ekfv not in _mappings:
         raise IOError('unknown EKF type')
+    return _mappings[ekfv]
@@ -0,0 +1,167 @@
+"""
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+
+Builds the ardupilot mapping tables from ardufields.csv, the labels, multipliers and units
+of every message. Each table is compiled for an EKF type from ARDUPILOT_MAP and written to
+ardupilot.json, which get_ardupilot_mapping loads without any unit conversion work.
+After changing ARDUPILOT_MAP, EKF_PREFIXES or ardufields.csv regenerate it with:
+
+    python -m flightdata.mapping.compiler ardufields.csv
+"""
+
+import argparse
+import json
+from typing import Dict, List, Tuple
+
+from flightdata.fields import Fields
+from flightdata.units import registry
+from flightdata.mapping import TABLES
+
+# the message prefix of each EKF, replaces {EKF} in ARDUPILOT_MAP
+EKF_PREFIXES = {2: 'NKF', 3: 'XKF'}
+
+# the values are read as logged, no unit conversion
+RAW = 'raw'
+
+# (field, position, message type, label, unit) for each mapped column of an ardupilot log.
+# the unit is None to take it from ardufields.csv, which gives the unit after the message
+# multiplier. pymavlink applies the multipliers carried by the format characters, so this holds
+# for most fields, the exceptions give the unit of the decoded value.
+ARDUPILOT_MAP = [
+    (Fields.TIME, 0, None, 'timestamp', 'second'),
+    (Fields.TIME, 1, '{EKF}1', 'TimeUS', 'microsecond'),
+] + [
+    (Fields.TXCONTROLS, i, 'RCIN', 'C{}'.format(i + 1), RAW) for i in range(8)
+] + [
+    (Fields.SERVOS, i, 'RCOU', 'C{}'.format(i + 1), RAW) for i in range(8)
+] + [
+    (Fields.FLIGHTMODE, 0, 'MODE', 'Mode', RAW),
+    (Fields.FLIGHTMODE, 1, 'MODE', 'ModeNum', RAW),
+    (Fields.FLIGHTMODE, 2, 'MODE', 'Rsn', RAW),
+    (Fields.POSITION, 0, '{EKF}1', 'PN', None),
+    (Fields.POSITION, 1, '{EKF}1', 'PE', None),
+    (Fields.POSITION, 2, '{EKF}1', 'PD', None),
+    (Fields.GLOBALPOSITION, 0, 'GPS', 'Lat', None),
+    (Fields.GLOBALPOSITION, 1, 'GPS', 'Lng', None),
+    (Fields.SENSORALTITUDE, 0, 'GPS', 'Alt', None),
+    (Fields.SENSORALTITUDE, 1, 'BARO', 'Alt', None),
+    (Fields.GPSSATCOUNT, 0, 'GPS', 'NSats', RAW),
+    (Fields.ATTITUDE, 0, '{EKF}1', 'Roll', None),
+    (Fields.ATTITUDE, 1, '{EKF}1', 'Pitch', None),
+    (Fields.ATTITUDE, 2, '{EKF}1', 'Yaw', None),
+    (Fields.AXISRATE, 0, 'IMU', 'GyrX', None),
+    (Fields.AXISRATE, 1, 'IMU', 'GyrY', None),
+    (Fields.AXISRATE, 2, 'IMU', 'GyrZ', None),
+    (Fields.BATTERY, 0, 'BAT', 'Volt', None),
+    (Fields.BATTERY, 1, 'BAT2', 'Volt', None),
+    (Fields.CURRENT, 0, 'BAT', 'Curr', None),
+    (Fields.CURRENT, 1, 'BAT2', 'Curr', None),
+    (Fields.AIRSPEED, 0, 'ARSP', 'Airspeed', None),
+    (Fields.ACCELERATION, 0, 'IMU', 'AccX', None),
+    (Fields.ACCELERATION, 1, 'IMU', 'AccY', None),
+    (Fields.ACCELERATION, 2, 'IMU', 'AccZ', None),
+    (Fields.VELOCITY, 0, '{EKF}1', 'VN', None),
+    (Fields.VELOCITY, 1, '{EKF}1', 'VE', None),
+    (Fields.VELOCITY, 2, '{EKF}1', 'VD', None),
+    (Fields.WIND, 0, '{EKF}2', 'VWN', None),
+    (Fields.WIND, 1, '{EKF}2', 'VWE', None),
+    (Fields.RPM, 0, 'RPM', 'rpm1', '14 / minute'),  # the logged rpm is scaled by 14
+    (Fields.RPM, 1, 'RPM', 'rpm2', '14 / minute'),
+    (Fields.MAGNETOMETER, 0, 'MAG', 'MagX', RAW),
+    (Fields.MAGNETOMETER, 1, 'MAG', 'MagY', RAW),
+    (Fields.MAGNETOMETER, 2, 'MAG', 'MagZ', RAW),
+]
+
+# ardufields.csv unit names that pint does not know
+_UNIT_NAMES = {
+    'degheading': 'degree', 'deglatitude': 'degree', 'deglongitude': 'degree',
+    'm/s/s': 'm / s ** 2', 'us': 'microsecond', 'satellites': 'dimensionless', '': 'dimensionless'
+}
+
+
+def read_ardufields(filename) -> Dict[str, Dict[str, Tuple[float, str]]]:
+    """Read the ardufields.csv listing, lines of message type, kind (labels, mults or units) and values.
+    Lines that are not in that form are skipped.
+
+    Returns:
+        Dict[str, Dict[str, Tuple[float, str]]]: the (multiplier, unit) of each label of each message type
+    """
+    rows = {}
+    with open(filename) as f:
+        for line in f:
+            parts = [part.strip() for part in line.rstrip('\n').split(',')]
+            if len(parts) < 3 or parts[1] not in ('labels', 'mults', 'units'):
+                continue
+            rows.setdefault(parts[0], {})[parts[1]] = parts[2:]
+
+    messages = {}
+    for mtype, row in rows.items():
+        if not all(kind in row for kind in ('labels', 'mults', 'units')):
+            continue
+        messages[mtype] = {
+            label: (float(mult) if mult not in ('', 'UNKNOWN') else None, unit)
+            for label, mult, unit in zip(row['labels'], row['mults'], row['units'])
+        }
+    return messages
+
+
+def _factor(field, unit: str) -> float:
+    if unit == RAW:
+        return 1.0
+    quantity = registry().Quantity(_UNIT_NAMES.get(unit, unit))
+    return float((quantity / field.unit).to('dimensionless').magnitude)
+
+
+def compile_mapping(messages: Dict, ekf_type: int, mapping: List = None) -> Dict[str, List]:
+    """The table of one EKF type.
+
+    Args:
+        messages (Dict): the output of read_ardufields
+        ekf_type (int): a key of EKF_PREFIXES
+        mapping (List, optional): in the form of ARDUPILOT_MAP. Defaults to ARDUPILOT_MAP.
+
+    Returns:
+        Dict[str, List]: the io_names, base_names and factors_to_base of FieldIOInfo.from_table
+    """
+    table = dict(io_names=[], base_names=[], factors_to_base=[])
+    for field, position, mtype, label, unit in ARDUPILOT_MAP if mapping is None else mapping:
+        if mtype is None:
+            io_name = label
+        else:
+            mtype = mtype.format(EKF=EKF_PREFIXES[ekf_type])
+            if label not in messages.get(mtype, {}):
+                raise KeyError('{} {} is not in ardufields'.format(mtype, label))
+            io_name = mtype + label
+            unit = messages[mtype][label][1] if unit is None else unit
+        table['io_names'].append(io_name)
+        table['base_names'].append(field.names[position])
+        table['factors_to_base'].append(_factor(field, unit))
+    return table
+
+
+def compile_all(ardufields) -> Dict[str, Dict[str, List]]:
+    """the tables of every EKF type, keyed by the EKF type as a string"""
+    messages = read_ardufields(ardufields)
+    return {str(ekf_type): compile_mapping(messages, ekf_type) for ekf_type in EKF_PREFIXES}
+
+
+def write_tables(tables: Dict, filename=TABLES):
+    with open(filename, 'w') as f:
+        json.dump(tables, f, indent=1)
+        f.write('\n')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='compile the ardupilot mapping tables from ardufields.csv')
+    parser.add_argument('ardufields', help='path to ardufields.csv')
+    parser.add_argument('-o', '--output', default=TABLES, help='the json file to write')
+    args = parser.parse_args()
+    write_tables(compile_all(args.ardufields), args.output)
@@ -0,0 +1,150 @@
+"""
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from typing import Dict, List
+import numpy as np
+import pandas as pd
+
+from flightdata.data import Flight, resample
+from flightdata.fields import Fields
+from flightdata.mapping import get_ardupilot_mapping
+from flightdata.stream import LogStream
+
+
+# the groups that time_actual is read from, the EKF core message of EKF3 and EKF2
+_EKF_GROUPS = ['XKF1', 'NKF1']
+
+
+class MultiRateFlight(object):
+    """Flight data held as one dataframe per source message group (IMU, GPS, BARO...), each at
+    its native rate with its own time index, rather than one wide NaN padded frame.
+    Groups are only aligned onto a common time base when align or to_flight is called.
+
+    Args:
+        groups (Dict[str, pd.DataFrame]): tool columns of each group, indexed by time
+            in seconds from zero_time
+        parameters (Dict): the log parameters
+        zero_time (float): time of the start of the flight
+    """
+    def __init__(self, groups: Dict[str, pd.DataFrame], parameters: Dict = None, zero_time: float = 0):
+        self.groups = groups
+        self.parameters = parameters
+        self.zero_time = zero_time
+
+    @staticmethod
+    def from_log(log_path, skip_start=True):
+        """Constructor from an ardupilot bin file, see Flight.from_log"""
+        stream = LogStream(log_path)
+        raw = {}
+        for mtype, _, row in stream.messages():
+            columns = raw.setdefault(mtype, {})
+            for name, value in row.items():
+                columns.setdefault(name, []).append(value)
+
+        io_info = get_ardupilot_mapping(stream.parameters['AHRS_EKF_TYPE'])
+
+        groups = {}
+        for mtype, columns in raw.items():
+            data = io_info.convert(pd.DataFrame(columns))
+            data.index = data[Fields.TIME.names[0]].to_numpy()
+            data.index.name = 'time_index'
+            groups[mtype] = data
+
+        first_good_time = None
+        if skip_start:
+            for group in groups.values():
+                if 'magnetometer_0' in group.columns:
+                    first_good_time = Flight._magnetometer_start(group)
+                    break
+        if first_good_time is None:
+            first_good_time = min(group.index[0] for group in groups.values())
+
+        for mtype, group in groups.items():
+            group = group.loc[first_good_time:]
+            group.index = group.index - first_good_time
+            groups[mtype] = group
+
+        return MultiRateFlight(groups, stream.parameters, first_good_time)
+
+    @property
+    def duration(self) -> float:
+        return max(group.index[-1] for group in self.groups.values() if len(group) > 0)
+
+    def locate(self, fields) -> Dict[str, List[str]]:
+        """the column names of the fields held by each group.
+        time_flight is in every group, so it is only included where TIME is the only field requested.
+        Otherwise time_actual, the EKF timestamp, is taken from the EKF group (XKF1 or NKF1, else the
+        first group that has it) and time_flight is left out, align regenerates it.
+        """
+        names = Fields.some_names(fields)
+        located = {}
+        for group_name, group in self.groups.items():
+            _names = [name for name in names if name in group.columns]
+            if len(_names) > 0:
+                located[group_name] = _names
+
+        if names != Fields.TIME.names:
+            flight_time, actual_time = Fields.TIME.names
+            holders = [group_name for group_name, _names in located.items() if actual_time in _names]
+            actual_group = next((group_name for group_name in _EKF_GROUPS if group_name in holders),
+                                holders[0] if len(holders) > 0 else None)
+            for group_name in list(located.keys()):
+                located[group_name] = [
+                    name for name in located[group_name]
+                    if name != flight_time and (name != actual_time or group_name == actual_group)
+                ]
+                if len(located[group_name]) == 0:
+                    del located[group_name]
+        return located
+
+    def read_fields(self, fields) -> Dict[str, pd.DataFrame]:
+        """the requested fields at their native rates, one dataframe per group"""
+        return {
+            group_name: self.groups[group_name][names]
+            for group_name, names in self.locate(fields).items()
+        }
+
+    def align(self, fields=None, time_base=None, method: str = 'previous') -> Flight:
+        """Sample the requested fields from each group onto one time base.
+
+        Args:
+            fields (Field or List[Field], optional): the fields to align. Defaults to all of them.
+            time_base (array like, optional): the times to sample at, seconds from the start of
+                the flight. Defaults to the times of the group with the most rows.
+            method (str, optional): nearest, previous or linear, see Flight.read_times.
+                Defaults to 'previous', the latest value available at each time.
+
+        Returns:
+            Flight: with one row per time in the time base
+        """
+        fields = Fields.all() if fields is None else fields
+        if time_base is None:
+            time_base = max(self.groups.values(), key=len).index.to_numpy()
+        time_base = np.asarray(time_base, dtype=float)
+
+        columns = {}
+        for group_name, names in self.locate(fields).items():
+            group = self.groups[group_name]
+            values = resample(group.index.to_numpy(), group[names].to_numpy(dtype=float), time_base, method)
+            # the first sample of a group is not available before it was recorded
+            values[time_base < group.index[0]] = np.nan
+            columns.update(zip(names, values.T))
+
+        columns.setdefault(Fields.TIME.names[0], time_base + self.zero_time)
+
+        data = pd.DataFrame(columns, index=pd.Index(time_base + self.zero_time, name='time_index'))
+        return Flight(data, self.parameters)
+
+    def to_flight(self) -> Flight:
+        """the equivalent of Flight.from_log, one wide NaN padded frame with a row per message"""
+        data = pd.concat(list(self.groups.values())).sort_index(kind='stable')
+        return Flight(Flight._add_missing_columns(data), self.parameters)
@@ -0,0 +1,129 @@
+"""
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Union
+
+
+class StageRecord(object):
+    """the cost of one stage of a load"""
+    def __init__(self, name: str):
+        self.name = name
+        self.wall_time = None
+        self.rows = None
+        self.memory = None  # change in traced python memory, bytes
+        self.peak_memory = None  # peak traced python memory during the stage, bytes
+
+    def to_dict(self) -> Dict:
+        return dict(name=self.name, wall_time=self.wall_time, rows=self.rows,
+                    memory=self.memory, peak_memory=self.peak_memory)
+
+    def __repr__(self):
+        # a NullTimer does not time its stages
+        wall_time = 'untimed' if self.wall_time is None else '{:.4f}s'.format(self.wall_time)
+        return 'StageRecord({}, {}, rows={}, peak_memory={})'.format(
+            self.name, wall_time, self.rows, self.peak_memory)
+
+
+class StageTimer(object):
+    """Records wall time, rows and memory for each stage of a load.
+
+    Args:
+        callback (Callable[[StageRecord], None], optional): called as each stage completes,
+            for example to ship the records to a metrics system.
+        trace_memory (bool, optional): measure memory with tracemalloc. Tracing slows every allocation,
+            so the wall times are inflated while it is on. Defaults to False. When the caller is
+            already tracing the stages record the change in memory but not the peak, as measuring it
+            would reset the caller's peak.
+    """
+    enabled = True
+
+    def __init__(self, callback: Callable[[StageRecord], None] = None, trace_memory: bool = False):
+        self.callback = callback
+        self.trace_memory = trace_memory
+        self.records: List[StageRecord] = []
+        self._started_tracing = False
+
+    @staticmethod
+    def create(profile: Union[None, bool, Callable, 'StageTimer']) -> 'StageTimer':
+        """the timer for the profile argument of Flight.from_log"""
+        if profile is None or profile is False:
+            return NullTimer()
+        elif isinstance(profile, StageTimer):
+            return profile
+        elif profile is True:
+            return StageTimer()
+        else:
+            return StageTimer(profile)
+
+    def __enter__(self):
+        """trace memory for the duration of the load"""
+        self._started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+        return self
+
+    def __exit__(self, *args):
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @contextmanager
+    def stage(self, name: str):
+        """time the body of the with statement, set rows on the yielded record"""
+        record = StageRecord(name)
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        # the peak is global, only reset it when this timer owns the tracing
+        own_peak = tracing and self._started_tracing
+        if own_peak:
+            tracemalloc.reset_peak()
+        if tracing:
+            start_memory, _ = tracemalloc.get_traced_memory()
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.wall_time = time.perf_counter() - start
+            if tracing:
+                memory, peak = tracemalloc.get_traced_memory()
+                record.memory = memory - start_memory
+                record.peak_memory = peak if own_peak else None
+            self.records.append(record)
+            if self.callback is not None:
+                self.callback(record)
+
+    @property
+    def total_time(self) -> float:
+        return sum(record.wall_time for record in self.records)
+
+    def to_dict(self) -> Dict[str, Dict]:
+        return {record.name: record.to_dict() for record in self.records}
+
+
+class NullTimer(StageTimer):
+    """a timer that records nothing, used when profiling is off"""
+    enabled = False
+
+    def __init__(self):
+        super().__init__(trace_memory=False)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    @contextmanager
+    def stage(self, name: str):
+        yield StageRecord(name)
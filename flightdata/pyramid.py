@@ -0,0 +1,171 @@
+"""
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import os
+from typing import List
+import numpy as np
+import pandas as pd
+
+from flightdata.fields import Fields
+from flightdata.store import write_store, read_store
+
+
+STATISTICS = ['min', 'max', 'mean']
+
+
+def lod_path(filename) -> str:
+    """the file the pyramid of the flight stored at filename is saved to"""
+    return os.path.splitext(filename)[0] + '.lod'
+
+
+def _round(values: np.ndarray, dtype: str, towards: float) -> np.ndarray:
+    """cast to dtype rounding towards +-inf, so the stored min and max still bound the data"""
+    rounded = values.astype(dtype)
+    moved = rounded > values if towards < 0 else rounded < values
+    rounded[moved] = np.nextafter(rounded[moved], np.array(towards, dtype))
+    return rounded
+
+
+class Envelope(object):
+    """The result of a Pyramid query, one row per bucket of 2 ** level samples.
+    min, max and mean are (buckets, columns) arrays, time holds the start time of each bucket.
+    """
+    def __init__(self, level: int, columns: List[str], time: np.ndarray,
+                 minimum: np.ndarray, maximum: np.ndarray, mean: np.ndarray):
+        self.level = level
+        self.columns = columns
+        self.time = time
+        self.min = minimum
+        self.max = maximum
+        self.mean = mean
+
+    def __len__(self):
+        return len(self.time)
+
+
+class Pyramid(object):
+    """A level of detail pyramid over the columns of a flight for plotting. Level l holds the
+    min, max and mean of each run of 2 ** l samples, level 0 is the data itself.
+    Use Flight.pyramid() to get the pyramid of a flight, it is built once and cached.
+
+    Args:
+        data (pd.DataFrame): the flight data, level 0 reads from it
+        columns (List[str]): the columns covered
+        levels (List[pd.DataFrame]): levels 1 and up, indexed by the bucket start time, with the
+            columns {name}_min, {name}_max and {name}_mean for each name
+    """
+    def __init__(self, data: pd.DataFrame, columns: List[str], levels: List[pd.DataFrame]):
+        self.data = data
+        self.columns = columns
+        self.levels = levels
+
+    @staticmethod
+    def build(data: pd.DataFrame, columns: List[str] = None, min_length: int = 64) -> 'Pyramid':
+        """Build the levels by halving until a level has fewer than min_length buckets.
+
+        Args:
+            data (pd.DataFrame): the flight data
+            columns (List[str], optional): the columns to cover. Defaults to all the field columns.
+            min_length (int, optional): the size of the coarsest level. Defaults to 64.
+        """
+        if columns is None:
+            columns = [name for name in Fields.all_names() if name in data.columns]
+        dtypes = Fields.dtypes()
+        index = data.index.to_numpy()
+        values = data[columns].to_numpy(dtype=float, na_value=np.nan)
+
+        minimum, maximum = values, values
+        valid = ~np.isnan(values)
+        total, count = np.where(valid, values, 0), valid.astype(np.int64)
+
+        levels = []
+        level = 0
+        while len(minimum) >= 2 * min_length:
+            level += 1
+            if len(minimum) % 2 == 1:
+                # pad with an empty sample so the last bucket is a pair
+                minimum, maximum, total, count = [
+                    np.concatenate([array, np.full((1, len(columns)), fill, array.dtype)])
+                    for array, fill in zip([minimum, maximum, total, count], [np.nan, np.nan, 0, 0])]
+            # fmin and fmax ignore NaN unless both samples are NaN
+            minimum = np.fmin(minimum[0::2], minimum[1::2])
+            maximum = np.fmax(maximum[0::2], maximum[1::2])
+            total = total[0::2] + total[1::2]
+            count = count[0::2] + count[1::2]
+            with np.errstate(invalid='ignore'):
+                mean = total / count
+
+            frame = {}
+            for i, name in enumerate(columns):
+                dtype = 'float64' if dtypes.get(name) == 'float64' else 'float32'
+                frame['{}_min'.format(name)] = _round(minimum[:, i], dtype, -np.inf)
+                frame['{}_max'.format(name)] = _round(maximum[:, i], dtype, np.inf)
+                frame['{}_mean'.format(name)] = mean[:, i].astype(dtype)
+            levels.append(pd.DataFrame(frame, index=pd.Index(index[::2 ** level], name='time_index')))
+        return Pyramid(data, columns, levels)
+
+    def query(self, start_time: float, end_time: float, width: int, columns: List[str] = None) -> Envelope:
+        """The envelope of the data between two times at no more than width points.
+
+        Args:
+            start_time (float): seconds from the start of the flight
+            end_time (float): seconds from the start of the flight
+            width (int): the number of points wanted, usually the plot width in pixels
+            columns (List[str], optional): some of the columns. Defaults to all of them.
+
+        Returns:
+            Envelope: from the finest level with at most width buckets in the range (or the coarsest
+                level), the buckets cover the range and may start a little before it.
+        """
+        columns = self.columns if columns is None else columns
+        first, last = np.searchsorted(self.data.index.to_numpy(), [start_time, end_time], side='right')
+        first = max(first - 1, 0)
+
+        # the level follows from the row count, each level halves it
+        level = int(np.ceil(np.log2(max(last - first, 1) / width))) if last - first > width else 0
+        level = min(level, len(self.levels))
+
+        if level == 0:
+            values = self.data[columns].iloc[first:last].to_numpy(dtype=float, na_value=np.nan)
+            return Envelope(0, columns, self.data.index.to_numpy()[first:last], values, values, values)
+
+        table = self.levels[level - 1]
+        rows = slice(first >> level, -(-last >> level))
+        return Envelope(
+            level, columns, table.index.to_numpy()[rows],
+            *[table[['{}_{}'.format(name, statistic) for name in columns]].iloc[rows].to_numpy(dtype=float)
+              for statistic in STATISTICS])
+
+    def save(self, filename):
+        """write the levels to a columnar store (./store.py), all levels in one table"""
+        lengths = [len(level) for level in self.levels]
+        if len(self.levels) > 0:
+            table = pd.concat(self.levels)
+        else:
+            table = pd.DataFrame(
+                {'{}_{}'.format(name, statistic): [] for name in self.columns for statistic in STATISTICS},
+                index=pd.Index([], dtype=float, name='time_index'))
+        write_store(filename, table, dict(columns=self.columns, lengths=lengths))
+
+    @staticmethod
+    def load(filename, data: pd.DataFrame, mmap: bool = True) -> 'Pyramid':
+        """Open levels written by save.
+
+        Args:
+            filename (str): the file written by save
+            data (pd.DataFrame): the flight data, for level 0
+            mmap (bool, optional): memory map the levels. Defaults to True.
+        """
+        table, meta = read_store(filename, mmap)
+        offsets = np.cumsum([0] + meta['lengths'])
+        levels = [table.iloc[start:stop] for start, stop in zip(offsets[:-1], offsets[1:])]
+        return Pyramid(data, meta['columns'], levels)
@@ -0,0 +1,214 @@
+"""
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+
+The valid, low quality and missing periods of each field of a flight. Built in one pass over
+the columns when a log is read and saved with the store, so questions like
+
+    flight.quality().valid(Fields.GLOBALPOSITION)
+
+are answered from a few spans rather than by scanning the columns.
+"""
+
+from typing import Dict, Callable, Optional
+import numpy as np
+import pandas as pd
+
+from flightdata.fields import Fields
+
+
+# the fewest satellites for a usable GPS fix
+MIN_SATS = 6
+
+# samples further apart than this many times the usual sample spacing of a field are a dropout
+GAP_FACTOR = 5
+
+
+def _column(data: pd.DataFrame, name: str) -> Optional[np.ndarray]:
+    return data[name].to_numpy(dtype=float, na_value=np.nan) if name in data.columns else None
+
+
+def _gps_ok(data: pd.DataFrame) -> Optional[np.ndarray]:
+    sats = _column(data, Fields.GPSSATCOUNT.names[0])
+    return None if sats is None else sats >= MIN_SATS
+
+
+def _magnetometer_ok(data: pd.DataFrame) -> Optional[np.ndarray]:
+    # the magnetometer logs zeros until it has initialised
+    magnetometer = _column(data, Fields.MAGNETOMETER.names[0])
+    return None if magnetometer is None else magnetometer != 0
+
+
+# the checks of each column name, rows of the column that fail are low quality rather than valid.
+# a check returns None when the columns it needs were not read
+CHECKS: Dict[str, Callable[[pd.DataFrame], Optional[np.ndarray]]] = dict(
+    [(name, _gps_ok) for name in Fields.GLOBALPOSITION.names + [Fields.SENSORALTITUDE.names[0]]] +
+    [(name, _magnetometer_ok) for name in Fields.MAGNETOMETER.names]
+)
+
+_EMPTY = np.empty((0, 2))
+
+
+def _runs(times: np.ndarray, good: np.ndarray, max_gap: float, breaks: np.ndarray = None):
+    """the (start, stop) times of the runs of good and of not good samples. A run ends at a change
+    of good, where it meets the next run, or at a dropout: a step in times longer than max_gap or
+    where breaks (one per step) is set"""
+    if len(times) == 0:
+        return _EMPTY, _EMPTY
+    dropout = np.diff(times) > max_gap
+    if breaks is not None:
+        dropout |= breaks
+    split = np.flatnonzero(dropout | (good[1:] != good[:-1]))
+    starts = np.concatenate([[0], split + 1])
+    stops = np.concatenate([np.where(dropout[split], split, split + 1), [len(times) - 1]])
+    spans = np.column_stack([times[starts], times[stops]])
+    return spans[good[starts]], spans[~good[starts]]
+
+
+def _union(spans: np.ndarray) -> np.ndarray:
+    """merge overlapping or touching (n, 2) spans into sorted, disjoint spans"""
+    if len(spans) == 0:
+        return _EMPTY
+    spans = spans[np.argsort(spans[:, 0], kind='stable')]
+    reach = np.maximum.accumulate(spans[:, 1])
+    first = np.concatenate([[True], spans[1:, 0] > reach[:-1]])
+    last = np.concatenate([first[1:], [True]])
+    return np.column_stack([spans[first, 0], reach[last]])
+
+
+def _subtract(spans: np.ndarray, remove: np.ndarray) -> np.ndarray:
+    """the parts of the sorted, disjoint spans that are not in the sorted, disjoint remove spans"""
+    if len(spans) == 0 or len(remove) == 0:
+        return spans
+    keep = []
+    for start, stop in spans:
+        for cut_start, cut_stop in remove[(remove[:, 1] >= start) & (remove[:, 0] <= stop)]:
+            if cut_start > start:
+                keep.append((start, cut_start))
+            start = max(start, cut_stop)
+        if stop > start:
+            keep.append((start, stop))
+    return np.array(keep, dtype=float).reshape(-1, 2)
+
+
+def _max_gap(times: np.ndarray, max_gap: float = None) -> float:
+    if max_gap is not None:
+        return max_gap
+    return GAP_FACTOR * np.median(np.diff(times)) if len(times) > 1 else np.inf
+
+
+def _complement(spans: np.ndarray, start: float, end: float) -> np.ndarray:
+    """the periods between start and end that are not in the sorted, disjoint spans"""
+    bounds = np.concatenate([[start], spans.ravel(), [end]]).reshape(-1, 2)
+    return bounds[bounds[:, 1] > bounds[:, 0]]
+
+
+class QualityIndex(object):
+    """The valid and low quality spans of each field, (n, 2) arrays of start and stop times
+    in seconds from the start of the flight. Each column is indexed on its own, as the columns of
+    a field can come from different messages (altitude from GPS and BARO) and some are never
+    logged. A column is valid where its samples are no further apart than the dropout limit and
+    pass its CHECKS. A field is valid where any of its logged columns is, low quality where one is
+    low quality and none is valid, and gaps are the rest of the flight.
+    TIME is indexed from time_actual, a span also ends where it steps back or jumps.
+
+    Use Flight.quality() rather than building one.
+
+    Args:
+        end (float): the time of the last row
+        valid (Dict[str, np.ndarray]): the valid spans of each field name
+        low_quality (Dict[str, np.ndarray]): the low quality spans of each field name
+    """
+    def __init__(self, end: float, valid: Dict[str, np.ndarray], low_quality: Dict[str, np.ndarray]):
+        self.end = end
+        self._valid = valid
+        self._low_quality = low_quality
+
+    @staticmethod
+    def build(data: pd.DataFrame, max_gap: float = None) -> 'QualityIndex':
+        """Index the field columns of data.
+
+        Args:
+            data (pd.DataFrame): the flight data, indexed by time from the start of the flight
+            max_gap (float, optional): the longest step between samples of a field that is not a
+                dropout, in seconds. Defaults to GAP_FACTOR times the median step of each field.
+        """
+        index = data.index.to_numpy(dtype=float)
+        valid, low_quality = {}, {}
+        for field in Fields.all():
+            # time_flight is the index, so TIME is judged by time_actual
+            names = Fields.TIME.names[1:] if field is Fields.TIME else field.names
+            names = [name for name in names if name in data.columns]
+            if len(names) == 0:
+                continue
+            field_valid, field_low = [], []
+            for name in names:
+                present = data[name].notna().to_numpy()
+                times = index[present]
+                good = CHECKS[name](data) if name in CHECKS else None
+                good = np.ones(len(times), dtype=bool) if good is None else good[present]
+                breaks = None
+                if field is Fields.TIME:
+                    actual = np.diff(data[name].to_numpy(dtype=float)[present])
+                    breaks = (actual <= 0) | (np.abs(actual - np.diff(times)) > _max_gap(times, max_gap))
+                column_valid, column_low = _runs(times, good, _max_gap(times, max_gap), breaks)
+                field_valid.append(column_valid)
+                field_low.append(column_low)
+            valid[field.name] = _union(np.concatenate(field_valid))
+            low_quality[field.name] = _subtract(_union(np.concatenate(field_low)), valid[field.name])
+        return QualityIndex(float(index[-1]) if len(index) > 0 else 0.0, valid, low_quality)
+
+    def valid(self, field) -> np.ndarray:
+        """the (n, 2) start and stop times of the valid spans of field, empty if it was not read"""
+        return self._valid.get(field.name, _EMPTY)
+
+    def low_quality(self, field) -> np.ndarray:
+        """the spans where field was logged but failed its check"""
+        return self._low_quality.get(field.name, _EMPTY)
+
+    def gaps(self, field) -> np.ndarray:
+        """the spans where field was not logged, dropouts and the ends of the flight it does not cover"""
+        spans = np.concatenate([self.valid(field), self.low_quality(field)])
+        return _complement(spans[np.argsort(spans[:, 0])], 0.0, self.end)
+
+    def is_valid(self, field, times) -> np.ndarray:
+        """whether field is valid at each of times (seconds from the start of the flight)"""
+        spans = self.valid(field)
+        times = np.asarray(times, dtype=float)
+        if len(spans) == 0:
+            return np.zeros(times.shape, dtype=bool)
+        row = np.searchsorted(spans[:, 0], times, side='right') - 1
+        return (row >= 0) & (times <= spans[np.maximum(row, 0), 1])
+
+    def window(self, start_time: float, end_time: float) -> 'QualityIndex':
+        """the index of the period between two times, shifted so it starts at 0"""
+        def _clip(spans):
+            spans = np.clip(spans[(spans[:, 1] >= start_time) & (spans[:, 0] <= end_time)], start_time, end_time)
+            return spans - start_time
+        return QualityIndex(
+            end_time - start_time,
+            {name: _clip(spans) for name, spans in self._valid.items()},
+            {name: _clip(spans) for name, spans in self._low_quality.items()})
+
+    def to_dict(self) -> Dict:
+        """json serialisable, for the store metadata"""
+        return dict(
+            end=self.end,
+            valid={name: spans.tolist() for name, spans in self._valid.items()},
+            low_quality={name: spans.tolist() for name, spans in self._low_quality.items()})
+
+    @staticmethod
+    def from_dict(values: Dict) -> 'QualityIndex':
+        def _spans(spans):
+            return np.array(spans, dtype=float).reshape(-1, 2)
+        return QualityIndex(
+            values['end'],
+            {name: _spans(spans) for name, spans in values['valid'].items()},
+            {name: _spans(spans) for name, spans in values['low_quality'].items()})
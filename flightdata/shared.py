@@ -0,0 +1,106 @@
+"""
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+
+Hand a Flight to worker processes without pickling its data. The columns are copied once into a
+shared memory block in the layout of the columnar store (./store.py), workers are sent a small
+handle and attach to the block as read only Flights over the shared arrays:
+
+    with SharedFlight(flight) as shared:
+        with ProcessPoolExecutor() as executor:
+            results = list(executor.map(analyse, [shared.handle] * 8))
+
+    def analyse(handle):
+        flight = SharedFlight.attach(handle)
+        ...
+"""
+
+import weakref
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict
+
+import numpy as np
+
+from flightdata.data import Flight
+from flightdata.quality import QualityIndex
+from flightdata.fields import Fields
+from flightdata.store import _make_layout, _place_blocks, _read_blocks
+
+
+def _close(memory: SharedMemory):
+    try:
+        memory.close()
+    except BufferError:
+        # arrays over the block are still referenced, the mapping goes when they do
+        pass
+
+
+def _release(memory: SharedMemory):
+    _close(memory)
+    memory.unlink()
+
+
+class SharedFlight(object):
+    """A copy of a Flight in shared memory, owned by the process that published it.
+    The block is unlinked by release(), on leaving a with block or when this object is garbage
+    collected. Attached workers keep their mapping until they drop their Flights.
+
+    Args:
+        flight (Flight): the flight to publish
+    """
+    def __init__(self, flight: Flight):
+        data = flight.data
+        meta = dict(zero_time=float(flight.zero_time), parameters=flight.parameters,
+                    quality=flight.quality().to_dict())
+        header, blocks = _make_layout(data, meta)
+        size = _place_blocks(blocks, len(data), 0)
+
+        self.memory = SharedMemory(create=True, size=max(size, 1))
+        self._finalizer = weakref.finalize(self, _release, self.memory)
+        for entry, arrays in blocks:
+            offset = entry['offset']
+            for array in arrays:
+                np.ndarray(array.shape, array.dtype, buffer=self.memory.buf, offset=offset)[:] = array
+                offset += array.nbytes
+        self.handle = dict(name=self.memory.name, header=header)
+
+    def release(self):
+        """unlink the block, later attaches fail"""
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.release()
+
+    @staticmethod
+    def attach(handle: Dict) -> Flight:
+        """The Flight published as handle, its columns are read only views of the shared block.
+
+        Args:
+            handle (Dict): SharedFlight.handle, it pickles to a few kilobytes
+
+        Returns:
+            Flight
+        """
+        memory = SharedMemory(name=handle['name'])
+        header = handle['header']
+
+        def _read_array(dtype, offset, shape):
+            array = np.ndarray(shape, dtype, buffer=memory.buf, offset=offset)
+            array.flags.writeable = False
+            return array
+
+        meta = header['meta']
+        flight = Flight(_read_blocks(header, _read_array), meta['parameters'], meta['zero_time'])
+        flight._cached('quality', Fields.all(), lambda: QualityIndex.from_dict(meta['quality']))
+        weakref.finalize(flight, _close, memory)
+        return flight
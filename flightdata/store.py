@@ -0,0 +1,218 @@
+"""
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import json
+import struct
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# file layout:
+#   MAGIC | header length (uint64 little endian) | json header | padding | blocks
+# each block holds columns that share a dtype as one contiguous (columns, rows) array,
+# so a single column is a contiguous run of bytes in the file and can be paged in on its own.
+# block kinds:
+#   numpy: plain numpy columns
+#   masked: pandas nullable integer columns, the values block is followed by a block of the null mask
+#   category: a single categorical column, the block holds the codes and the header the categories
+MAGIC = b'FLTSTORE'
+VERSION = 1
+_ALIGN = 64
+
+
+def _aligned(offset: int) -> int:
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def _make_blocks(data: pd.DataFrame) -> list:
+    """group the columns into blocks, returns a list of (header entry, list of (rows,) arrays)"""
+    groups = {}
+    for name, dtype in data.dtypes.items():
+        if isinstance(dtype, pd.CategoricalDtype):
+            key = ('category', name)
+        elif pd.api.types.is_extension_array_dtype(dtype):
+            key = ('masked', dtype.name)
+        else:
+            key = ('numpy', np.dtype(dtype).str)
+        groups.setdefault(key, []).append(name)
+
+    blocks = []
+    for (kind, dtype), columns in groups.items():
+        if kind == 'numpy':
+            blocks.append((
+                dict(kind=kind, dtype=dtype, columns=columns),
+                [data[column].to_numpy() for column in columns]
+            ))
+        elif kind == 'masked':
+            values_dtype = np.dtype(data[columns[0]].dtype.numpy_dtype).str
+            blocks.append((
+                dict(kind=kind, dtype=dtype, values_dtype=values_dtype, columns=columns),
+                [data[column].to_numpy(dtype=values_dtype, na_value=0) for column in columns] +
+                [data[column].isna().to_numpy() for column in columns]
+            ))
+        else:
+            codes = data[dtype].cat.codes.to_numpy()
+            blocks.append((
+                dict(kind=kind, dtype=codes.dtype.str, columns=columns,
+                     categories=data[dtype].cat.categories.to_list()),
+                [codes]
+            ))
+    return blocks
+
+
+def _json_default(value):
+    # numpy scalars sneak in via the log parameters
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError('{} is not json serialisable'.format(type(value)))
+
+
+def _make_layout(data: pd.DataFrame, meta: Dict) -> Tuple[Dict, list]:
+    """the header (without offsets) and the (header entry, arrays) of the index and each block"""
+    blocks = [(
+        dict(kind='numpy', name=data.index.name, dtype=np.dtype(data.index.dtype).str),
+        [data.index.to_numpy()]
+    )] + _make_blocks(data)
+    header = dict(
+        version=VERSION,
+        nrows=len(data),
+        columns=data.columns.to_list(),
+        index=blocks[0][0],
+        blocks=[block[0] for block in blocks[1:]],
+        meta=meta
+    )
+    return header, blocks
+
+
+def _place_blocks(blocks: list, nrows: int, offset: int) -> int:
+    """set the offset of each block, starting at offset, returns the end of the last block"""
+    for entry, arrays in blocks:
+        entry['offset'] = offset
+        offset = _aligned(offset + nrows * sum(array.dtype.itemsize for array in arrays))
+    return offset
+
+
+def write_store(filename, data: pd.DataFrame, meta: Dict):
+    """Write a dataframe and its metadata to a columnar binary store.
+
+    Args:
+        filename (str): the file to write
+        data (pd.DataFrame): the data to store, the index is stored alongside the columns
+        meta (Dict): json serialisable metadata (zero_time, parameters etc)
+    """
+    nrows = len(data)
+    header, blocks = _make_layout(data, meta)
+
+    # the offsets are part of the header, so repeat the layout until the header fits in front of them
+    encoded = b''
+    while True:
+        offset = _place_blocks(blocks, nrows, _aligned(len(MAGIC) + 8 + len(encoded)))
+        _encoded = json.dumps(header, default=_json_default).encode('utf-8')
+        if len(_encoded) <= len(encoded):
+            break
+        encoded = _encoded
+    encoded = _encoded
+
+    with open(filename, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<Q', len(encoded)))
+        f.write(encoded)
+        for entry, arrays in blocks:
+            f.seek(entry['offset'])
+            for array in arrays:
+                np.ascontiguousarray(array).tofile(f)
+        f.truncate(offset)
+
+
+def read_header(filename) -> Dict:
+    with open(filename, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise IOError('{} is not a flight store'.format(filename))
+        length, = struct.unpack('<Q', f.read(8))
+        header = json.loads(f.read(length).decode('utf-8'))
+    if header['version'] > VERSION:
+        raise IOError('unsupported flight store version {}'.format(header['version']))
+    return header
+
+
+def _read_array(filename, dtype, offset, shape, mmap):
+    if mmap:
+        if np.prod(shape) == 0:
+            return np.empty(shape, dtype=dtype)
+        return np.memmap(filename, dtype=dtype, mode='r', offset=offset, shape=shape)
+    with open(filename, 'rb') as f:
+        f.seek(offset)
+        return np.fromfile(f, dtype=dtype, count=int(np.prod(shape))).reshape(shape)
+
+
+def read_store(filename, mmap: bool = True) -> Tuple[pd.DataFrame, Dict]:
+    """Read a columnar binary store.
+
+    Args:
+        filename (str): the file to read
+        mmap (bool, optional): memory map the columns rather than reading them. Defaults to True.
+
+    Returns:
+        Tuple[pd.DataFrame, Dict]: the data and the metadata
+    """
+    header = read_header(filename)
+    data = _read_blocks(header, lambda dtype, offset, shape: _read_array(filename, dtype, offset, shape, mmap))
+    return data, header['meta']
+
+
+def _in_order(data: pd.DataFrame, columns: list) -> pd.DataFrame:
+    """data with its columns in the stored order. data[columns] would copy every block, slicing
+    the blocks keeps the columns as views of the mapped arrays"""
+    columns = pd.Index(columns)
+    manager = data._mgr.reindex_indexer(
+        columns, data.columns.get_indexer(columns), axis=0, copy=False, only_slice=True)
+    return pd.DataFrame(manager)
+
+
+def _read_blocks(header: Dict, read_array: Callable) -> pd.DataFrame:
+    """build the dataframe from the blocks, read_array(dtype, offset, shape) returns the array of a block"""
+    nrows = header['nrows']
+
+    frames = []
+    for block in header['blocks']:
+        columns = block['columns']
+        kind = block.get('kind', 'numpy')
+        if kind == 'numpy':
+            values = read_array(block['dtype'], block['offset'], (len(columns), nrows))
+            # the transpose of a (columns, rows) array is exactly the block pandas keeps internally
+            frames.append(pd.DataFrame(values.T, columns=columns, copy=False))
+        elif kind == 'masked':
+            values = read_array(block['values_dtype'], block['offset'], (len(columns), nrows))
+            masks = read_array('|b1', block['offset'] + values.nbytes, (len(columns), nrows))
+            frames.append(pd.DataFrame({
+                column: pd.arrays.IntegerArray(values[i], masks[i]) for i, column in enumerate(columns)
+            }, copy=False))
+        elif kind == 'category':
+            codes = read_array(block['dtype'], block['offset'], (nrows,))
+            frames.append(pd.DataFrame({
+                columns[0]: pd.Categorical.from_codes(codes, block['categories'])
+            }, copy=False))
+        else:
+            raise IOError('unknown block kind {}'.format(kind))
+
+    if len(frames) == 1:
+        data = frames[0]
+    elif len(frames) == 0:
+        data = pd.DataFrame(index=pd.RangeIndex(nrows), columns=header['columns'])
+    else:
+        data = _in_order(pd.concat(frames, axis=1, copy=False), header['columns'])
+
+    index = header['index']
+    data.index = pd.Index(np.array(read_array(index['dtype'], index['offset'], (nrows,))), name=index['name'])
+    return data
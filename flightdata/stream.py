@@ -0,0 +1,187 @@
+"""
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import mmap
+import os
+import threading
+import time
+from typing import Dict, Iterator, List, Tuple
+import pandas as pd
+
+from pymavlink.DFReader import DFReader_binary
+
+from flightdata.data import Flight, LOG_MESSAGES
+from flightdata.mapping import get_ardupilot_mapping
+
+
+def _mapped_names() -> set:
+    names = set()
+    for ekf_type in [2, 3]:
+        names |= set(get_ardupilot_mapping(ekf_type).io_names)
+    return names
+
+
+def _extend(parser: DFReader_binary, size: int):
+    """let a reader see the bytes appended to its file, its position is kept"""
+    parser.data_map.close()
+    parser.data_map = mmap.mmap(parser.filehandle.fileno(), size, access=mmap.ACCESS_READ)
+    parser.data_len = size
+    parser.remaining = size - parser.offset
+
+
+class LogStream(object):
+    """Read an ardupilot bin file one message at a time, collecting rows of the mapped
+    columns (named as join_logs names them, message type + field) into time windows.
+    Only the current window is held in memory.
+    """
+    def __init__(self, log_path, types: List[str] = None):
+        self.log_path = log_path
+        self.types = LOG_MESSAGES if types is None else types
+        self.parameters = {}
+        self._wanted = _mapped_names()
+        self._columns = {}
+
+    def _message_columns(self, message) -> list:
+        mtype = message.get_type()
+        if mtype not in self._columns:
+            self._columns[mtype] = [
+                (field, mtype + field) for field in message.get_fieldnames()
+                if mtype + field in self._wanted
+            ]
+        return self._columns[mtype]
+
+    def messages(self) -> Iterator[Tuple[str, float, Dict[str, float]]]:
+        """yield (message type, timestamp, mapped columns) for each data message in the log.
+        parameters are collected as they are read.
+        """
+        _parser = DFReader_binary(str(self.log_path), zero_time_base=True)
+        try:
+            while True:
+                message = _parser.recv_match(type=self.types + ['PARM'])
+                if message is None:
+                    break
+                if message.get_type() == 'PARM':
+                    self.parameters[message.Name] = message.Value
+                    continue
+                row = {name: getattr(message, field) for field, name in self._message_columns(message)}
+                row['timestamp'] = message._timestamp
+                yield message.get_type(), message._timestamp, row
+        finally:
+            _parser.filehandle.close()
+
+    def windows(self, window: float) -> Iterator[pd.DataFrame]:
+        """yield dataframes of the raw log rows, each covering window seconds"""
+        rows = []
+        end = None
+        for _, timestamp, row in self.messages():
+            if end is None:
+                end = timestamp + window
+            elif timestamp >= end:
+                yield pd.DataFrame.from_records(rows)
+                rows = []
+                end += window * ((timestamp - end) // window + 1)
+            rows.append(row)
+        if len(rows) > 0:
+            yield pd.DataFrame.from_records(rows)
+
+    def follow(self, poll: float = 1.0, stop: threading.Event = None) -> Iterator[pd.DataFrame]:
+        """Follow a log that is still being written, yielding a dataframe of the raw rows that
+        have been added each time the file grows. One reader is kept open, when the file grows it
+        is mapped again and parsing continues from the end of the last complete message, so each
+        poll only reads the new bytes.
+
+        Args:
+            poll (float, optional): seconds between checks for new data. Defaults to 1.
+            stop (threading.Event, optional): set to finish following.
+        """
+        stop = threading.Event() if stop is None else stop
+        _parser = None
+        try:
+            while not stop.is_set():
+                size = os.path.getsize(self.log_path) if os.path.exists(self.log_path) else 0
+                if size == 0 or (_parser is not None and size == _parser.data_len):
+                    stop.wait(poll)
+                    continue
+                if _parser is None:
+                    # the reader indexes the file and sets its clock from what has been written so far
+                    _parser = DFReader_binary(str(self.log_path), zero_time_base=True)
+                else:
+                    _extend(_parser, size)
+                rows = []
+                while True:
+                    start = _parser.offset
+                    message = _parser.recv_msg()
+                    if message is None:
+                        # the last message may be incomplete, read it again next time
+                        _parser.offset = start
+                        break
+                    mtype = message.get_type()
+                    if mtype == 'PARM':
+                        self.parameters[message.Name] = message.Value
+                    elif mtype in self.types:
+                        row = {name: getattr(message, field) for field, name in self._message_columns(message)}
+                        row['timestamp'] = message._timestamp
+                        rows.append(row)
+                if len(rows) > 0:
+                    yield pd.DataFrame.from_records(rows)
+        finally:
+            if _parser is not None:
+                _parser.data_map.close()
+                _parser.filehandle.close()
+
+    def replay(self, batch: float = 0.1, speed: float = 1.0) -> Iterator[pd.DataFrame]:
+        """Yield the raw rows of a finished log in batches of batch seconds, released at the rate
+        they were logged (scaled by speed), to test live ingestion.
+        """
+        started = None
+        for raw in self.windows(batch):
+            first = raw['timestamp'].iloc[0]
+            if started is None:
+                started = (time.monotonic(), first)
+            wait = started[0] + (raw['timestamp'].iloc[-1] - started[1]) / speed - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            yield raw
+
+
+def stream_log(log_path, window: float = 60.0, skip_start: bool = True) -> Iterator[Flight]:
+    """Read an ardupilot bin file as a sequence of Flights, each covering window seconds.
+        This is the streaming equivalent of Flight.from_log, each chunk is renamed and converted
+        to the tool fields in the same way. Only one window of the log is held in memory at a time,
+        so peak memory depends on the window rather than the length of the log.
+
+        Args:
+            log_path (str): path to the bin file
+            window (float, optional): length of each chunk in seconds. Defaults to 60.
+            skip_start (bool, optional): drop the data before the magnetometer has initialised. Defaults to True.
+
+        Yields:
+            Flight: the chunks in time order. zero_time of each chunk is its start time in the log
+    """
+    stream = LogStream(log_path)
+    io_info = None
+    first_good_time = None if skip_start else -float('inf')
+
+    for raw in stream.windows(window):
+        if io_info is None:
+            io_info = get_ardupilot_mapping(stream.parameters['AHRS_EKF_TYPE'])
+
+        data = Flight._add_missing_columns(io_info.convert(raw))
+
+        if first_good_time is None:
+            first_good_time = Flight._magnetometer_start(data)
+            if first_good_time is None:
+                continue
+        data = data.loc[first_good_time:]
+
+        if len(data) > 0:
+            yield Flight(data, dict(stream.parameters))
@@ -0,0 +1,91 @@
+"""
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from typing import Callable, Dict
+import numpy as np
+
+from flightdata.fields import CIDTypes
+
+
+EARTH_RADIUS = 6378137.0  # WGS84 equatorial radius, metres
+
+
+def rotate_xy(xy: np.ndarray, angle: float) -> np.ndarray:
+    """rotate the frame the (N, 2) north, east vectors are expressed in clockwise by angle (radians)"""
+    c, s = np.cos(angle), np.sin(angle)
+    return np.column_stack([c * xy[:, 0] + s * xy[:, 1], c * xy[:, 1] - s * xy[:, 0]])
+
+
+def gps_to_local(latlon: np.ndarray, origin: Dict[str, float]) -> np.ndarray:
+    """convert (N, 2) latitudes and longitudes (degrees) to north, east offsets (metres) from origin.
+    Uses the equirectangular approximation, which is fine over the few km of a flight.
+    """
+    lat0 = np.radians(origin['latitude'])
+    lon0 = np.radians(origin['longitude'])
+    latlon = np.radians(latlon)
+    return np.column_stack([
+        (latlon[:, 0] - lat0) * EARTH_RADIUS,
+        (latlon[:, 1] - lon0) * EARTH_RADIUS * np.cos(lat0)
+    ])
+
+
+def wrap_angle(angle: np.ndarray) -> np.ndarray:
+    return (angle + np.pi) % (2 * np.pi) - np.pi
+
+
+def _identity(data: np.ndarray) -> np.ndarray:
+    return data
+
+
+class Transformation(object):
+    """Vectorized handlers that re-express a flight in a frame rotated clockwise about the
+    vertical by heading (radians). GPS positions are converted to local north, east (metres)
+    from origin before they are rotated.
+
+    Each handler takes an (N, length) array of one field and returns the transformed
+    (N, length) array, pass handlers() to Flight.transform_arrays.
+    """
+    def __init__(self, heading: float = 0.0, origin: Dict[str, float] = None):
+        self.heading = heading
+        self.origin = origin
+
+    def cartesian(self, data: np.ndarray) -> np.ndarray:
+        return np.column_stack([rotate_xy(data[:, :2], self.heading), data[:, 2:]])
+
+    def euler(self, data: np.ndarray) -> np.ndarray:
+        return np.column_stack([data[:, :2], wrap_angle(data[:, 2] - self.heading)])
+
+    def body(self, data: np.ndarray) -> np.ndarray:
+        # body frame quantities do not depend on the earth frame
+        return data
+
+    def gps(self, data: np.ndarray) -> np.ndarray:
+        if self.origin is None:
+            return data
+        return rotate_xy(gps_to_local(data, self.origin), self.heading)
+
+    def zonly(self, data: np.ndarray) -> np.ndarray:
+        return data
+
+    def xy(self, data: np.ndarray) -> np.ndarray:
+        return rotate_xy(data, self.heading)
+
+    def handlers(self) -> Dict[int, Callable]:
+        return {
+            CIDTypes.CARTESIAN: self.cartesian,
+            CIDTypes.EULER: self.euler,
+            CIDTypes.BODY: self.body,
+            CIDTypes.NA: _identity,
+            CIDTypes.GPS: self.gps,
+            CIDTypes.ZONLY: self.zonly,
+            CIDTypes.XY: self.xy
+        }
@@ -19,6 +19,7 @@ setup(
     description='module for storage of and access to flight log data',
     author='Thomas David',
     author_email='thomasdavid0@gmai.com',
-    packages=['flightdata'],  # same as name
-    install_requires=['numpy', 'pandas', 'ardupilot_log_reader', 'pint'],
+    packages=['flightdata', 'flightdata.mapping', 'flightdata.config'],
+    package_data={'flightdata.mapping': ['ardupilot.json']},
+    install_requires=['numpy', 'pandas>=1.3,<2', 'ardupilot_log_reader', 'pint'],
 )
@@ -0,0 +1,88 @@
+import unittest
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from flightdata.data import Flight
+from flightdata.aio import AsyncLoader
+
+
+class TestAsyncLoader(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.loader = AsyncLoader(max_workers=1)
+
+    async def asyncTearDown(self):
+        self.loader.close()
+
+    async def test_from_csv(self):
+        flight = await self.loader.from_csv('test/ekfv3_test.csv')
+        self.assertIsInstance(flight, Flight)
+        self.assertEqual(len(self.loader._pending), 0)
+
+    async def test_deduplicate(self):
+        calls = []
+
+        def _load(path):
+            calls.append(path)
+            return object()
+
+        first, second = await asyncio.gather(
+            self.loader.load(_load, 'test/ekfv3_test.csv'),
+            self.loader.load(_load, './test/ekfv3_test.csv'))
+        self.assertIs(first, second)
+        self.assertEqual(len(calls), 1)
+
+    async def test_cancel(self):
+        release = threading.Event()
+        calls = []
+
+        def _load(path):
+            calls.append(path)
+            release.wait(5)
+            return path
+
+        blocking = asyncio.create_task(self.loader.load(_load, 'a'))
+        queued = [asyncio.create_task(self.loader.load(_load, 'b')) for _ in range(2)]
+        await asyncio.sleep(0.05)
+
+        # cancelling one of two requests leaves the shared load running
+        queued[0].cancel()
+        await asyncio.sleep(0.05)
+        self.assertEqual(len(self.loader._pending), 2)
+
+        # cancelling the last request drops the queued load before it starts
+        queued[1].cancel()
+        await asyncio.sleep(0.05)
+        release.set()
+        self.assertTrue(await blocking)
+        self.assertEqual(calls, ['a'])
+        self.assertEqual(len(self.loader._pending), 0)
+
+    async def test_cancel_running(self):
+        release = threading.Event()
+        calls = []
+
+        def _load(path):
+            calls.append(path)
+            release.wait(5)
+            return path
+
+        running = asyncio.create_task(self.loader.load(_load, 'a'))
+        await asyncio.sleep(0.05)
+        running.cancel()
+        await asyncio.sleep(0.05)
+
+        # the load is still running, a new request waits for it
+        self.assertEqual(len(self.loader._pending), 1)
+        again = asyncio.create_task(self.loader.load(_load, 'a'))
+        await asyncio.sleep(0.05)
+        release.set()
+        self.assertEqual(await again, 'a')
+        self.assertEqual(calls, ['a'])
+        self.assertEqual(len(self.loader._pending), 0)
+
+    async def test_process_pool(self):
+        with ProcessPoolExecutor(2) as executor:
+            async with AsyncLoader(executor=executor) as loader:
+                flights = await asyncio.gather(
+                    loader.from_csv('test/ekfv3_test.csv'), loader.from_csv('test/ekfv3_test.csv', compact=True))
+        self.assertAlmostEqual(flights[0].duration, flights[1].duration)
@@ -0,0 +1,60 @@
+import unittest
+import os
+import shutil
+from flightdata.data import Flight
+from flightdata.batch import ingest
+from flightdata.catalog import Catalog
+
+
+def _crash_on_b(log_path):
+    if log_path.endswith('b.csv'):
+        os._exit(1)
+    return Flight.from_csv(log_path)
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        os.makedirs('temp_logs', exist_ok=True)
+        shutil.copy('test/ekfv3_test.csv', 'temp_logs/a.csv')
+        with open('temp_logs/b.csv', 'w') as f:
+            f.write('not,a,flight\n')
+
+    def tearDown(self):
+        shutil.rmtree('temp_logs')
+        shutil.rmtree('temp_stores', ignore_errors=True)
+
+    def test_ingest(self):
+        progress = []
+        catalog = Catalog(':memory:')
+        results = ingest('temp_logs', 'temp_stores', workers=2, loader=Flight.from_csv,
+                         pattern='*.csv', progress=lambda *args: progress.append(args), catalog=catalog)
+        self.assertEqual(len(catalog.query(min_duration=600)), 1)
+        self.assertEqual(len(progress), 2)
+        failed = [result for result in results if not result.ok]
+        self.assertEqual(len(failed), 1)
+        self.assertTrue(failed[0].log_path.endswith('b.csv'))
+        flight = Flight.from_store('temp_stores/a.fds')
+        self.assertAlmostEqual(flight.duration, 601, 0)
+
+        results = ingest('temp_logs', 'temp_stores', workers=2, loader=Flight.from_csv, pattern='*.csv')
+        self.assertEqual(sorted(result.skipped for result in results), [False, True])
+
+        catalog = Catalog(':memory:')
+        results = ingest('temp_logs', 'temp_stores', workers=2, loader=Flight.from_csv,
+                         pattern='*.csv', catalog=catalog)
+        self.assertEqual(len(catalog.query(min_duration=600)), 1)
+
+        with open('temp_stores/a.fds', 'wb') as f:
+            f.write(b'not a store')
+        catalog = Catalog(':memory:')
+        results = ingest('temp_logs', 'temp_stores', workers=2, loader=Flight.from_csv,
+                         pattern='*.csv', catalog=catalog)
+        self.assertEqual([result.ok for result in results if result.log_path.endswith('a.csv')], [True])
+        self.assertEqual(len(catalog.query(min_duration=600)), 1)
+
+    def test_worker_dies(self):
+        results = ingest('temp_logs', 'temp_stores', workers=2, loader=_crash_on_b, pattern='*.csv')
+        self.assertEqual(len(results), 2)
+        failed = [result for result in results if not result.ok]
+        self.assertIn('b.csv', [os.path.basename(result.log_path) for result in failed])
+        self.assertIn('BrokenProcessPool', failed[0].error)
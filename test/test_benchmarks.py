@@ -0,0 +1,26 @@
+import unittest
+import numpy as np
+from flightdata.fields import Fields
+from benchmarks.synthetic import synthetic_flight
+from benchmarks.run import compare
+from benchmarks.startup import measure
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_synthetic_flight(self):
+        dense = synthetic_flight(60)
+        self.assertAlmostEqual(dense.duration, 60, 0)
+        self.assertEqual(dense.column_names, Fields.all_names())
+        self.assertFalse(dense.data.isna().any().any())
+        sparse = synthetic_flight(60, 'sparse')
+        self.assertEqual(np.isnan(sparse.read_numpy(Fields.GLOBALPOSITION)[0]).sum(), 300)
+
+    def test_compare(self):
+        baseline = {'a': dict(time=1, peak=100), 'b': dict(time=1, peak=100)}
+        results = {'a': dict(time=1.1, peak=100), 'b': dict(time=2, peak=100), 'c': dict(time=5, peak=5)}
+        self.assertEqual(compare(results, baseline, 0.25), [('b', 'time', 1, 2)])
+
+    def test_startup(self):
+        seconds, loaded = measure(repeat=1)
+        self.assertEqual(loaded, [])
+        self.assertGreater(seconds, 0)
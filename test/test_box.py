@@ -0,0 +1,28 @@
+import unittest
+import numpy as np
+from flightdata.fields import Fields
+from flightdata.data import Flight
+from flightdata.box import Box
+
+
+class TestBox(unittest.TestCase):
+    def setUp(self):
+        self.box = Box.from_f3a('test/gordano_box.f3a')
+        self.flight = Flight.from_csv('test/ekfv3_test.csv')
+
+    def test_from_f3a(self):
+        self.assertEqual(self.box.name, 'gordano')
+        self.assertAlmostEqual(self.box.pilot_position['latitude'], 51.4593455)
+        self.assertEqual(self.box.distance, 150)
+        centre = self.box.from_gps(np.array([[self.box.centre['latitude'], self.box.centre['longitude']]]))
+        self.assertAlmostEqual(centre[0, 0], 0, 6)
+        self.assertAlmostEqual(centre[0, 1], 150, -1)
+
+    def test_project(self):
+        gps = self.box.project(self.flight, Fields.GLOBALPOSITION)
+        position = self.box.project(self.flight, Fields.POSITION)
+        self.assertEqual(position.shape, (len(self.flight.data), 3))
+        self.assertIs(self.box.project(self.flight, Fields.POSITION), position)
+        # the ekf and gps positions agree to within a few metres
+        self.assertLess(np.nanmedian(np.abs(gps - position[:, :2])), 5)
+        np.testing.assert_array_equal(position[:, 2], -self.flight.read_numpy(Fields.POSITION)[2])
@@ -0,0 +1,45 @@
+import unittest
+import shutil
+from unittest import mock
+from flightdata.data import Flight
+from flightdata.fields import Fields
+from flightdata.cache import LogCache
+
+
+class TestLogCache(unittest.TestCase):
+    def setUp(self):
+        self.flight = Flight.from_csv('test/ekfv3_test.csv')
+        self.cache = LogCache('temp_cache')
+
+    def tearDown(self):
+        shutil.rmtree('temp_cache')
+
+    def test_key(self):
+        key = self.cache.key('test/ekfv3_test.csv', True)
+        self.assertEqual(key, self.cache.key('test/ekfv3_test.csv', True))
+        self.assertNotEqual(key, self.cache.key('test/ekfv3_test.csv', False))
+        self.assertNotEqual(key, self.cache.key('test/gordano_box.f3a', True))
+        self.assertNotEqual(key, self.cache.key('test/ekfv3_test.csv', True, [Fields.POSITION]))
+
+    def test_put_get(self):
+        self.assertIsNone(self.cache.get('a'))
+        self.cache.put('a', self.flight)
+        flight = Flight.from_store(self.cache.get('a'))
+        self.assertEqual(flight.duration, self.flight.duration)
+
+    def test_evict(self):
+        self.cache.put('a', self.flight)
+        self.cache.max_size = self.cache.size * 1.5
+        self.cache.put('b', self.flight)
+        self.assertIsNone(self.cache.get('a'))
+        self.assertIsNotNone(self.cache.get('b'))
+
+    def test_from_log_writable(self):
+        with open('temp_cache/a.BIN', 'wb') as f:
+            f.write(b'log')
+        with mock.patch.object(Flight, '_parse_log', side_effect=lambda *args: Flight(self.flight.data.copy())) as parse:
+            for _ in range(2):
+                flight = Flight.from_log('temp_cache/a.BIN', cache=self.cache)
+                flight.data.iloc[0, 0] = 12345
+        self.assertEqual(parse.call_count, 1)
+        self.assertEqual(flight.data.iloc[0, 0], 12345)
@@ -0,0 +1,48 @@
+import unittest
+import os
+from flightdata.fields import Fields
+from flightdata.data import Flight
+from flightdata.catalog import Catalog, summarise
+
+
+class TestCatalog(unittest.TestCase):
+    def setUp(self):
+        self.flight = Flight.from_csv('test/ekfv3_test.csv')
+        self.flight.parameters = {'AHRS_EKF_TYPE': 3, 'THR_MAX': 80}
+        self.flight.to_store('temp.fds')
+        self.catalog = Catalog(':memory:', parameters=['AHRS_EKF_TYPE'])
+        self.catalog.add('temp.fds')
+
+    def tearDown(self):
+        self.catalog.close()
+        os.remove('temp.fds')
+
+    def test_summarise(self):
+        summary = summarise(self.flight)
+        self.assertEqual(summary['modes'], [11])
+        self.assertAlmostEqual(summary['origin_latitude'], 51.459, 3)
+        self.assertLess(summary['min_longitude'], summary['max_longitude'])
+
+        summary = summarise(Flight(self.flight.read_fields([Fields.TIME, Fields.POSITION]), {}))
+        self.assertEqual(summary['modes'], [])
+        self.assertIsNone(summary['origin_latitude'])
+        self.assertIsNone(summary['max_longitude'])
+        self.assertAlmostEqual(summary['duration'], self.flight.duration)
+
+    def test_query(self):
+        self.assertEqual(len(self.catalog), 1)
+        origin = self.flight.origin()
+        entries = self.catalog.query(
+            near=(origin['latitude'], origin['longitude'], 100), min_duration=500,
+            modes=['RTL'], parameters={'AHRS_EKF_TYPE': 3})
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0].mode_labels, ['RTL'])
+        self.assertAlmostEqual(entries[0].load().duration, self.flight.duration)
+
+        self.assertEqual(self.catalog.query(near=(51.0, -2.79, 1000)), [])
+        self.assertEqual(self.catalog.query(min_duration=1000), [])
+        self.assertEqual(self.catalog.query(modes=[4]), [])
+        self.assertEqual(self.catalog.query(parameters={'THR_MAX': 80}), [])
+
+        self.catalog.add('temp.fds', self.flight)
+        self.assertEqual(len(self.catalog), 1)
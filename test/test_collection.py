@@ -0,0 +1,26 @@
+import unittest
+import numpy as np
+from flightdata.fields import Fields
+from flightdata.data import Flight
+from flightdata.collection import FlightCollection
+
+
+class TestFlightCollection(unittest.TestCase):
+    def setUp(self):
+        self.flight = Flight.from_csv('test/ekfv3_test.csv')
+        self.flights = [self.flight.subset(start, start + 60) for start in [100, 200, 300]]
+        self.collection = FlightCollection(self.flights, [Fields.POSITION, Fields.VELOCITY])
+
+    def test_stack(self):
+        self.assertEqual(self.collection.data.shape, (3, 600, 6))
+        np.testing.assert_array_almost_equal(
+            self.collection.channel('position_x')[1, :10],
+            self.flights[1].read_times(Fields.POSITION, np.arange(10) / 10, 'linear')[:, 0])
+
+    def test_statistics(self):
+        low, high = self.collection.envelope()
+        mean = self.collection.mean()
+        self.assertEqual(mean.shape, (600, 6))
+        self.assertTrue(np.all(low <= mean) and np.all(mean <= high))
+        np.testing.assert_array_almost_equal(self.collection.percentile(50), np.median(self.collection.data, axis=0))
+        self.assertEqual(self.collection.percentile([5, 95]).shape, (2, 600, 6))
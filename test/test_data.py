@@ -1,7 +1,10 @@
 import unittest
 from flightdata.fields import Fields
-from flightdata.data import Flight
+from flightdata.data import Flight, LOG_MESSAGES, log_messages
+from benchmarks.synthetic import synthetic_flight
 import os
+import pandas as pd
+import numpy as np
 
 class TestFlightData(unittest.TestCase):
     def setUp(self):
@@ -40,3 +43,157 @@ class TestFlightData(unittest.TestCase):
     def test_missing_arsp(self):
         flight = Flight.from_log('test/00000150.BIN')
         self.assertGreater(flight.duration, 500)
+
+    def test_to_from_store(self):
+        self.flight.to_store('temp.fds')
+        flight2 = Flight.from_store('temp.fds')
+        self.assertEqual(flight2.zero_time, self.flight.zero_time)
+        self.assertEqual(flight2.duration, self.flight.duration)
+        pd.testing.assert_frame_equal(
+            flight2.read_fields(Fields.POSITION), self.flight.read_fields(Fields.POSITION))
+        del flight2
+        os.remove('temp.fds')
+
+    def test_read_closest(self):
+        row = self.flight.read_closest(['time_flight'], 100.02)
+        self.assertAlmostEqual(row[0], 100 + self.flight.zero_time, 0)
+
+    def test_read_times(self):
+        times = np.array([-1, 0, 100.02, 300.5, 1000])
+        nearest = self.flight.read_times(Fields.TIME, times)
+        self.assertEqual(nearest.shape, (5, 2))
+        for time, row in zip(times, nearest):
+            self.assertEqual(row[0], self.flight.read_closest(['time_flight'], time)[0])
+        previous = self.flight.read_times(Fields.TIME, times, 'previous')
+        self.assertTrue(np.all(previous[1:, 0] - self.flight.zero_time <= np.maximum(times[1:], 0)))
+        linear = self.flight.read_times([Fields.TIME], times, 'linear')
+        np.testing.assert_array_almost_equal(linear[1:4, 0], times[1:4] + self.flight.zero_time)
+        self.assertTrue(np.isnan(linear[0, 0]))
+
+    @unittest.skip("reading log from bin takes a bit longer")
+    def test_stream_log(self):
+        from flightdata.stream import stream_log
+        flight = Flight.from_log('test/ekfv3_test.BIN')
+        chunks = list(stream_log('test/ekfv3_test.BIN', 60))
+        self.assertAlmostEqual(chunks[0].zero_time, flight.zero_time, 1)
+        self.assertAlmostEqual(chunks[-1].zero_time + chunks[-1].duration, flight.zero_time + flight.duration, 1)
+
+    def test_compact(self):
+        compact = self.flight.compact()
+        self.assertLessEqual(
+            compact.data.memory_usage(deep=True).sum(),
+            self.flight.data.memory_usage(deep=True).sum() / 2)
+        self.assertEqual(compact.data['servos_0'].dtype, 'UInt16')
+        self.assertEqual(compact.data['mode_0'].dtype, 'category')
+        np.testing.assert_array_almost_equal(
+            compact.read_numpy(Fields.POSITION), self.flight.read_numpy(Fields.POSITION), 5)
+
+        compact.to_store('temp.fds')
+        flight2 = Flight.from_store('temp.fds')
+        pd.testing.assert_frame_equal(flight2.data, compact.data)
+        # still a view of the mapped file after restoring the column order
+        base = flight2.data['position_x'].values
+        while base.base is not None and not isinstance(base, np.memmap):
+            base = base.base
+        self.assertIsInstance(base, np.memmap)
+        del flight2
+        os.remove('temp.fds')
+
+    def test_from_csv_fields(self):
+        flight = Flight.from_csv('test/ekfv3_test.csv', [Fields.POSITION, Fields.ATTITUDE])
+        self.assertEqual(
+            flight.data.columns.to_list(), Fields.some_names([Fields.TIME, Fields.POSITION, Fields.ATTITUDE]))
+        self.assertEqual(flight.zero_time, self.flight.zero_time)
+        np.testing.assert_array_equal(flight.read_numpy(Fields.POSITION), self.flight.read_numpy(Fields.POSITION))
+
+        compact = Flight.from_csv('test/ekfv3_test.csv', Fields.TXCONTROLS, compact=True)
+        self.assertEqual(compact.data['tx_controls_0'].dtype, 'UInt16')
+        self.assertEqual(compact.data['time_flight'].dtype, 'float64')
+
+    def test_log_messages(self):
+        self.assertEqual(log_messages(), LOG_MESSAGES)
+        self.assertEqual(log_messages([Fields.POSITION, Fields.ATTITUDE]), ['NKF1', 'XKF1', 'MAG'])
+        self.assertEqual(log_messages(Fields.WIND, skip_start=False), ['NKF1', 'NKF2', 'XKF1', 'XKF2'])
+        self.assertEqual(log_messages(Fields.BATTERY, skip_start=False), ['BAT', 'BAT2', 'NKF1', 'XKF1'])
+
+    def test_subset_view(self):
+        short_flight = self.flight.subset(100, 200)
+        self.assertTrue(np.shares_memory(short_flight.data.to_numpy(), self.flight.data.to_numpy()))
+        self.assertAlmostEqual(short_flight.zero_time, self.flight.zero_time + 100, 0)
+        self.assertEqual(short_flight.data.index[0], 0)
+
+        shorter_flight = short_flight.subset(10, 20)
+        self.assertIs(shorter_flight.parent, self.flight)
+        direct = self.flight.subset(110, 120)
+        self.assertEqual((shorter_flight.start, shorter_flight.stop), (direct.start, direct.stop))
+
+        flight_copy = short_flight.copy()
+        self.assertFalse(np.shares_memory(flight_copy.data.to_numpy(), self.flight.data.to_numpy()))
+        self.assertEqual(flight_copy.duration, short_flight.duration)
+
+    def test_subset_view_read_only(self):
+        before = self.flight.data.copy()
+        for flight in [self.flight, self.flight.compact()]:
+            view = flight.subset(100, 200)
+            for name in ['position_x', 'servos_0', 'mode_0']:
+                with self.assertRaises(ValueError):
+                    view.data.iloc[0, view.data.columns.get_loc(name)] = view.data[name].iloc[1]
+        pd.testing.assert_frame_equal(self.flight.data, before)
+
+        view = self.flight.subset(100, 200)
+        flight_copy = view.copy()
+        flight_copy.data.iloc[0, 0] = 12345
+        self.assertEqual(flight_copy.data.iloc[0, 0], 12345)
+        pd.testing.assert_frame_equal(self.flight.data, before)
+
+    def test_mode_segments(self):
+        segments = self.flight.mode_segments()
+        self.assertEqual(len(segments), 1)
+        self.assertEqual(segments.label[0], 'RTL')
+        self.assertIs(self.flight.mode_segments(), segments)
+
+        data = self.flight.data.copy()
+        data[Fields.FLIGHTMODE.names] = np.nan
+        no_modes = Flight(data)
+        self.assertEqual(len(no_modes.mode_segments()), 0)
+        self.assertEqual(no_modes.mode_subsets('RTL'), [])
+
+        flight = synthetic_flight(1500)
+        acro = flight.mode_subsets('ACRO')
+        self.assertEqual(len(acro), 1)
+        self.assertAlmostEqual(acro[0].zero_time, flight.zero_time + 600)
+        self.assertAlmostEqual(acro[0].duration, 299.9)
+        self.assertTrue(np.all(acro[0].read_numpy(Fields.FLIGHTMODE)[0] == 4))
+        self.assertEqual(len(flight.mode_subsets(0)), 2)
+        self.assertEqual(flight.mode_subsets('QACRO'), [])
+
+        late = flight.subset(1000, -1).mode_subsets('Manual')
+        self.assertIs(late[0].parent, flight)
+        self.assertAlmostEqual(late[0].zero_time, flight.zero_time + 1200)
+
+
+class TestPandasInternals(unittest.TestCase):
+    """store._in_order and data._read_only use private pandas attributes, these fail first and
+    clearly when a pandas release changes them"""
+    def test_block_manager(self):
+        data = pd.DataFrame({'a': np.arange(3.), 'b': pd.array([1, None, 3], dtype='Int16'),
+                             'c': pd.Categorical([1, 2, 1])})
+        message = 'pandas {} changed the private BlockManager API'.format(pd.__version__)
+        self.assertTrue(hasattr(data, '_mgr'), message)
+        self.assertTrue(hasattr(data._mgr, 'blocks'), message)
+        values = [block.values for block in data._mgr.blocks]
+        self.assertTrue(any(isinstance(getattr(value, '_data', None), np.ndarray) and
+                            isinstance(getattr(value, '_mask', None), np.ndarray) for value in values),
+                        'pandas {} changed the private layout of IntegerArray'.format(pd.__version__))
+        self.assertTrue(any(isinstance(getattr(value, '_ndarray', None), np.ndarray) for value in values),
+                        'pandas {} changed the private layout of Categorical'.format(pd.__version__))
+
+    def test_in_order(self):
+        from flightdata.store import _in_order
+        data = pd.concat([pd.DataFrame({'b': np.arange(3.)}), pd.DataFrame({'a': np.arange(3.)})], axis=1)
+        self.assertTrue(hasattr(data, '_mgr') and hasattr(data._mgr, 'reindex_indexer'),
+                        'pandas {} changed the private BlockManager API'.format(pd.__version__))
+        ordered = _in_order(data, ['a', 'b'])
+        self.assertEqual(ordered.columns.to_list(), ['a', 'b'])
+        self.assertTrue(np.shares_memory(ordered['a'].to_numpy(), data['a'].to_numpy()),
+                        'pandas {} copies the blocks in _in_order'.format(pd.__version__))
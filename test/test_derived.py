@@ -0,0 +1,57 @@
+import unittest
+import numpy as np
+from flightdata.fields import Fields
+from flightdata.data import Flight
+from flightdata.derived import DerivedFields, ned_to_body
+
+
+class TestDerivedFields(unittest.TestCase):
+    def setUp(self):
+        self.flight = Flight.from_csv('test/ekfv3_test.csv')
+
+    def test_ned_to_body(self):
+        attitude = np.array([[0, 0, np.pi / 2], [0, np.pi / 2, 0], [np.pi / 2, 0, 0]])
+        ned = np.array([[1.0, 0, 0], [1.0, 0, 0], [0, 0, 1.0]])
+        np.testing.assert_array_almost_equal(ned_to_body(attitude, ned), [[0, -1, 0], [0, 0, 1], [0, 1, 0]])
+
+    def test_read_fields(self):
+        data = self.flight.read_fields([Fields.TIME, DerivedFields.ENERGY, DerivedFields.AIRANGLES])
+        self.assertEqual(data.columns.to_list(), Fields.some_names(
+            [Fields.TIME, DerivedFields.ENERGY, DerivedFields.AIRANGLES]))
+        np.testing.assert_array_almost_equal(
+            data['energy_kinetic'], 0.5 * np.sum(self.flight.read_numpy(Fields.VELOCITY) ** 2, axis=0))
+        np.testing.assert_array_almost_equal(
+            np.linalg.norm(self.flight.read_numpy(DerivedFields.BODYVELOCITY), axis=0),
+            np.linalg.norm(self.flight.read_numpy(Fields.VELOCITY), axis=0))
+        self.assertEqual(self.flight.read_times(DerivedFields.LOADFACTOR, [10, 20]).shape, (2, 1))
+
+    def test_sparse(self):
+        # rows alternate between the messages of ATTITUDE and VELOCITY and the message of WIND
+        data = self.flight.data.copy()
+        data.iloc[0::2, [data.columns.get_loc(name) for name in Fields.WIND.names]] = np.nan
+        data.iloc[1::2, [data.columns.get_loc(name) for name in Fields.ATTITUDE.names + Fields.VELOCITY.names]] = np.nan
+        sparse = Flight(data)
+        angles = sparse.read_numpy(DerivedFields.AIRANGLES)
+        self.assertTrue(np.all(np.isnan(angles[:, 0])))
+        self.assertFalse(np.any(np.isnan(angles[:, 1:])))
+
+        held = self.flight.data.copy()
+        held.iloc[0::2, [held.columns.get_loc(name) for name in Fields.WIND.names]] = \
+            held[Fields.WIND.names].shift(1).iloc[0::2].to_numpy()
+        held.iloc[1::2, [held.columns.get_loc(name) for name in Fields.ATTITUDE.names + Fields.VELOCITY.names]] = \
+            held[Fields.ATTITUDE.names + Fields.VELOCITY.names].shift(1).iloc[1::2].to_numpy()
+        np.testing.assert_array_almost_equal(
+            sparse.read_numpy(DerivedFields.AIRVELOCITY)[:, 1:], Flight(held).read_numpy(DerivedFields.AIRVELOCITY)[:, 1:])
+
+    def test_invalidate(self):
+        energy = self.flight._derived_values(DerivedFields.ENERGY)
+        angles = self.flight._derived_values(DerivedFields.AIRANGLES)
+        self.assertIs(self.flight._derived_values(DerivedFields.ENERGY), energy)
+
+        self.flight.data['wind_x'] = self.flight.data['wind_x'] + 5
+        self.flight.invalidate(Fields.WIND)
+        self.assertIs(self.flight._derived_values(DerivedFields.ENERGY), energy)
+        self.assertFalse(np.allclose(self.flight._derived_values(DerivedFields.AIRANGLES), angles))
+
+        self.flight.invalidate()
+        self.assertEqual(len(self.flight._cache), 0)
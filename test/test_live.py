@@ -0,0 +1,170 @@
+import unittest
+import os
+import struct
+import threading
+from unittest import mock
+import numpy as np
+import pandas as pd
+from flightdata.fields import Fields
+from flightdata.live import RingBuffer, LiveFlight
+from flightdata.stream import LogStream, DFReader_binary, stream_log
+
+
+def _raw(start, n):
+    timestamp = 100 + (start + np.arange(n)) / 10
+    return pd.DataFrame({'timestamp': timestamp, 'XKF1PN': np.arange(start, start + n, dtype=float),
+                         'XKF1Roll': np.full(n, 90.0)})
+
+
+def _fmt(type_id, name, form, columns):
+    length = 3 + struct.calcsize('<' + form.replace('n', '4s').replace('N', '16s').replace('Z', '64s'))
+    return b'\xa3\x95\x80' + struct.pack(
+        '<BB4s16s64s', type_id, length, name.encode(), form.encode(), columns.encode())
+
+
+def _log(start, n, header=True, mag_start=None):
+    """the bytes of a bin log, with the formats and parameters if header, and n XKF1 messages at 10Hz.
+    With mag_start, MAG messages at 5Hz follow them, zero before the mag_start'th XKF1 message"""
+    data = b''
+    if header:
+        data = _fmt(0x80, 'FMT', 'BBnNZ', 'Type,Length,Name,Format,Columns') + \
+            _fmt(64, 'PARM', 'QNf', 'TimeUS,Name,Value') + _fmt(65, 'XKF1', 'Qfff', 'TimeUS,Roll,PN,VN') + \
+            _fmt(66, 'MAG', 'Qfff', 'TimeUS,MagX,MagY,MagZ') + \
+            b'\xa3\x95\x40' + struct.pack('<Q16sf', 1000, b'AHRS_EKF_TYPE', 3.0)
+    for i in range(start, start + n):
+        data += b'\xa3\x95\x41' + struct.pack('<Qfff', 1000000 + i * 100000, 90.0, float(i), 0.0)
+        if mag_start is not None and i % 2 == 0:
+            field = 0.0 if i < mag_start else 200.0 + i
+            data += b'\xa3\x95\x42' + struct.pack('<Qfff', 1000000 + i * 100000 + 50000, field, field, field)
+    return data
+
+
+class TestRingBuffer(unittest.TestCase):
+    def test_wraparound(self):
+        buffer = RingBuffer(['a', 'b'], 5)
+        buffer.append(pd.DataFrame({'a': [0., 1., 2.]}))
+        self.assertEqual(len(buffer), 3)
+        self.assertTrue(np.all(np.isnan(buffer.snapshot()[:, 1])))
+        buffer.append(pd.DataFrame({'a': [3., 4., 5., 6.], 'b': 1., 'c': 2.}))
+        self.assertEqual(len(buffer), 5)
+        np.testing.assert_array_equal(buffer.snapshot()[:, 0], [2., 3., 4., 5., 6.])
+        buffer.append(pd.DataFrame({'a': np.arange(7., 20.)}))
+        np.testing.assert_array_equal(buffer.snapshot()[:, 0], np.arange(15., 20.))
+
+    def test_concurrent_snapshots(self):
+        buffer = RingBuffer(['a', 'b'], 50)
+
+        def _write():
+            for i in range(500):
+                buffer.append(pd.DataFrame({'a': [float(i)] * 7, 'b': [float(i)] * 7}))
+
+        writer = threading.Thread(target=_write)
+        writer.start()
+        while writer.is_alive():
+            values = buffer.snapshot()
+            # rows are whole and in order
+            np.testing.assert_array_equal(values[:, 0], values[:, 1])
+            self.assertTrue(np.all(np.diff(values[:, 0]) >= 0))
+        writer.join()
+
+
+class TestLiveFlight(unittest.TestCase):
+    def test_ingest(self):
+        live = LiveFlight(20, {'AHRS_EKF_TYPE': 3})
+        live.run(_raw(start, 10) for start in range(0, 30, 10))
+        flight = live.snapshot()
+        self.assertEqual(len(flight.data), 20)
+        self.assertAlmostEqual(flight.zero_time, 101.0)
+        self.assertAlmostEqual(flight.duration, 1.9)
+        np.testing.assert_array_equal(flight.data['position_x'], np.arange(10., 30.))
+        np.testing.assert_array_almost_equal(flight.data['attitude_roll'], np.full(20, np.pi / 2))
+        self.assertTrue(np.all(np.isnan(flight.read_fields(Fields.TXCONTROLS).to_numpy(dtype=float))))
+
+    def test_empty_snapshot(self):
+        flight = LiveFlight(20, {'AHRS_EKF_TYPE': 3}).snapshot()
+        self.assertEqual(len(flight.data), 0)
+
+    def test_error(self):
+        def _source():
+            yield _raw(0, 10)
+            raise IOError('corrupt log')
+
+        live = LiveFlight(20, {'AHRS_EKF_TYPE': 3})
+        live.start(_source())
+        with self.assertRaises(IOError):
+            live.join()
+        with self.assertRaises(IOError):
+            live.snapshot()
+
+
+class TestLogStream(unittest.TestCase):
+    def tearDown(self):
+        if os.path.exists('temp.BIN'):
+            os.remove('temp.BIN')
+
+    def test_follow(self):
+        complete = _log(20, 10, False)
+        with open('temp.BIN', 'wb') as f:
+            # end part way through a message
+            f.write(_log(0, 20) + complete[:10])
+
+        stop = threading.Event()
+        with mock.patch('flightdata.stream.DFReader_binary', wraps=DFReader_binary) as reader:
+            batches = LogStream('temp.BIN').follow(0.01, stop)
+            np.testing.assert_array_equal(next(batches)['XKF1PN'], np.arange(20.))
+            with open('temp.BIN', 'ab') as f:
+                f.write(complete[10:])
+            second = next(batches)
+            stop.set()
+            batches.close()
+        np.testing.assert_array_equal(second['XKF1PN'], np.arange(20., 30.))
+        np.testing.assert_array_almost_equal(second['timestamp'], 1 + np.arange(20, 30) / 10)
+        self.assertEqual(reader.call_count, 1)
+
+        live = LiveFlight.follow('temp.BIN', 50, poll=0.01)
+        for _ in range(500):
+            if len(live.buffer) == 30:
+                break
+            threading.Event().wait(0.01)
+        live.stop()
+        np.testing.assert_array_equal(live.snapshot().data['position_x'], np.arange(30.))
+
+    def test_replay(self):
+        with open('temp.BIN', 'wb') as f:
+            f.write(_log(0, 30))
+        stream = LogStream('temp.BIN')
+        batches = list(stream.replay(batch=1.0, speed=100))
+        self.assertEqual(len(batches), 3)
+        np.testing.assert_array_equal(pd.concat(batches)['XKF1PN'], np.arange(30.))
+        self.assertEqual(stream.parameters['AHRS_EKF_TYPE'], 3)
+
+        live = LiveFlight.replay('temp.BIN', 20, speed=100)
+        live.join()
+        flight = live.snapshot()
+        np.testing.assert_array_equal(flight.data['position_x'], np.arange(10., 30.))
+
+    def test_stream_log(self):
+        with open('temp.BIN', 'wb') as f:
+            f.write(_log(0, 300, mag_start=25))
+        whole, = stream_log('temp.BIN', 1000)
+        # the magnetometer reads from 3.65s, data starts 3 seconds later
+        self.assertAlmostEqual(whole.zero_time, 6.65, delta=0.06)
+        self.assertFalse(np.any(whole.data['magnetometer_0'] == 0))
+
+        for window in [2, 7]:
+            chunks = list(stream_log('temp.BIN', window))
+            self.assertEqual(chunks[0].zero_time, whole.zero_time)
+            np.testing.assert_array_almost_equal(
+                np.concatenate([chunk.data.index + chunk.zero_time for chunk in chunks]),
+                whole.data.index + whole.zero_time)
+            np.testing.assert_array_equal(
+                pd.concat([chunk.data for chunk in chunks]).to_numpy(), whole.data.to_numpy())
+        # windows are laid out from the first message of the log, at 1s
+        np.testing.assert_array_almost_equal([chunk.zero_time for chunk in chunks[1:]], [8, 15, 22, 29])
+
+        unskipped, = stream_log('temp.BIN', 1000, skip_start=False)
+        self.assertAlmostEqual(unskipped.zero_time, 1.0)
+        self.assertEqual(len(unskipped.data), 450)
+        pd.testing.assert_frame_equal(
+            unskipped.data.loc[whole.zero_time - unskipped.zero_time:].reset_index(drop=True),
+            whole.data.reset_index(drop=True))
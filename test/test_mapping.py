@@ -0,0 +1,50 @@
+import unittest
+import json
+import numpy as np
+import pandas as pd
+from flightdata.fields import Fields
+from flightdata.mapping import get_ardupilot_mapping, TABLES
+from flightdata.mapping.compiler import read_ardufields, compile_all, compile_mapping
+
+
+class TestMappingCompiler(unittest.TestCase):
+    def setUp(self):
+        self.messages = read_ardufields('ardufields.csv')
+
+    def test_read_ardufields(self):
+        self.assertNotIn('0', self.messages)
+        self.assertEqual(self.messages['XKF1']['Roll'], (0.009999999776482582, 'deg'))
+        self.assertEqual(self.messages['GPS']['Lat'][1], 'deglatitude')
+
+    def test_tables_are_current(self):
+        with open(TABLES) as f:
+            self.assertEqual(json.load(f), compile_all('ardufields.csv'))
+
+    def test_factors(self):
+        io_info = get_ardupilot_mapping(3)
+        factors = dict(zip(io_info.io_names, io_info.factors_to_base))
+        self.assertAlmostEqual(factors['XKF1Roll'], np.pi / 180)
+        self.assertAlmostEqual(factors['XKF1TimeUS'], 1e-6)
+        self.assertAlmostEqual(factors['IMUGyrX'], 1.0)
+        self.assertAlmostEqual(factors['RPMrpm1'], 14)
+        self.assertEqual(factors['RCINC1'], 1)
+        self.assertIn('NKF2VWE', get_ardupilot_mapping(2).io_names)
+        with self.assertRaises(IOError):
+            get_ardupilot_mapping(1)
+
+    def test_convert(self):
+        data = pd.DataFrame({'XKF1Roll': [90.0], 'XKF1PN': [2.0], 'unmapped': [1.0]})
+        converted = get_ardupilot_mapping(3).convert(data)
+        self.assertEqual(sorted(converted.columns), ['attitude_roll', 'position_x'])
+        self.assertAlmostEqual(converted['attitude_roll'][0], np.pi / 2)
+
+    def test_gyro_units(self):
+        # ardupilot logs the IMU rates in rad/s, they were read as deg/s before
+        self.assertEqual(self.messages['IMU']['GyrX'][1], 'rad/s')
+        for ekf_type in [2, 3]:
+            converted = get_ardupilot_mapping(ekf_type).convert(pd.DataFrame({'IMUGyrX': [0.5], 'IMUGyrZ': [-2.0]}))
+            np.testing.assert_array_almost_equal(converted[['axis_rate_roll', 'axis_rate_yaw']].iloc[0], [0.5, -2.0])
+
+    def test_missing_label(self):
+        with self.assertRaises(KeyError):
+            compile_mapping(self.messages, 3, [(Fields.POSITION, 0, 'XKF1', 'PX', None)])
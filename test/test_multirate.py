@@ -0,0 +1,62 @@
+import unittest
+import os
+import numpy as np
+import pandas as pd
+from flightdata.fields import Fields
+from flightdata.data import Flight
+from flightdata.multirate import MultiRateFlight
+from flightdata.stream import stream_log
+from test.test_live import _log
+
+
+class TestMultiRateFlight(unittest.TestCase):
+    def setUp(self):
+        self.flight = Flight.from_csv('test/ekfv3_test.csv')
+        data = self.flight.data
+        self.multi = MultiRateFlight({
+            'XKF1': data[Fields.some_names([Fields.TIME, Fields.POSITION])],
+            'GPS': data[Fields.some_names([Fields.TIME, Fields.GLOBALPOSITION])].iloc[::5]
+        }, self.flight.parameters, self.flight.zero_time)
+
+    def test_locate(self):
+        self.assertEqual(self.multi.locate(Fields.POSITION), {'XKF1': Fields.POSITION.names})
+        self.assertEqual(
+            self.multi.locate([Fields.TIME, Fields.GLOBALPOSITION]),
+            {'XKF1': ['time_actual'], 'GPS': Fields.GLOBALPOSITION.names})
+        self.assertEqual(len(self.multi.read_fields(Fields.GLOBALPOSITION)['GPS']), 1200)
+
+    def test_align(self):
+        aligned = self.multi.align([Fields.POSITION, Fields.GLOBALPOSITION])
+        self.assertAlmostEqual(aligned.duration, self.flight.duration)
+        self.assertAlmostEqual(aligned.zero_time, self.flight.zero_time)
+        gps = aligned.read_numpy(Fields.GLOBALPOSITION)
+        expected = self.flight.read_numpy(Fields.GLOBALPOSITION)
+        np.testing.assert_array_equal(gps[:, 7], expected[:, 5])
+        np.testing.assert_array_equal(
+            aligned.read_numpy(Fields.POSITION), self.flight.read_numpy(Fields.POSITION))
+
+        for aligned in [self.multi.align(), self.multi.align([Fields.TIME, Fields.POSITION])]:
+            np.testing.assert_array_equal(aligned.data['time_actual'], self.flight.data['time_actual'])
+            np.testing.assert_array_almost_equal(aligned.data['time_flight'], self.flight.data['time_flight'])
+
+    def test_to_flight(self):
+        flight = self.multi.to_flight()
+        self.assertEqual(len(flight.data), len(self.flight.data) + 1200)
+        self.assertAlmostEqual(flight.zero_time, self.flight.zero_time)
+
+    def test_from_log(self):
+        with open('temp.BIN', 'wb') as f:
+            f.write(_log(0, 300, mag_start=25))
+        try:
+            multi = MultiRateFlight.from_log('temp.BIN')
+            flight, = stream_log('temp.BIN', 1000)
+        finally:
+            os.remove('temp.BIN')
+        self.assertEqual({name: len(group) for name, group in multi.groups.items()}, {'XKF1': 243, 'MAG': 121})
+        self.assertAlmostEqual(multi.zero_time, flight.zero_time, delta=0.06)
+        pd.testing.assert_frame_equal(multi.to_flight().data, flight.data, check_like=True)
+
+        aligned = multi.align(time_base=flight.data.index + flight.zero_time - multi.zero_time)
+        self.assertAlmostEqual(aligned.zero_time, flight.zero_time)
+        np.testing.assert_array_equal(aligned.data['time_actual'], flight.data['time_actual'].ffill())
+        np.testing.assert_array_equal(aligned.data['position_x'], flight.data['position_x'].ffill())
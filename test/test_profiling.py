@@ -0,0 +1,57 @@
+import unittest
+import tracemalloc
+import pandas as pd
+from flightdata.mapping import get_ardupilot_mapping
+from flightdata.profiling import StageTimer
+
+
+class TestProfiling(unittest.TestCase):
+    def setUp(self):
+        self.raw = pd.DataFrame({
+            'timestamp': [0.0, 0.1, 0.2],
+            'XKF1PN': [1.0, 2.0, 3.0],
+            'XKF1Roll': [0.0, 90.0, 180.0],
+            'NOTMAPPED': [0.0, 0.0, 0.0]
+        })
+
+    def test_convert_stages(self):
+        records = []
+        with StageTimer(records.append, trace_memory=True) as timer:
+            data = get_ardupilot_mapping(3).convert(self.raw, timer)
+        self.assertEqual(
+            [record.name for record in timer.records], ['column_intersection', 'unit_conversion'])
+        self.assertEqual(records, timer.records)
+        self.assertEqual(timer.records[1].rows, 3)
+        self.assertGreater(timer.records[1].peak_memory, 0)
+        self.assertAlmostEqual(data['attitude_roll'].iloc[2], 3.14159, 4)
+        self.assertNotIn('NOTMAPPED', data.columns)
+
+    def test_create(self):
+        self.assertFalse(StageTimer.create(None).enabled)
+        with StageTimer.create(None).stage('a') as record:
+            pass
+        self.assertEqual(repr(record), 'StageRecord(a, untimed, rows=None, peak_memory=None)')
+        self.assertTrue(StageTimer.create(True).enabled)
+        timer = StageTimer(trace_memory=False)
+        self.assertIs(StageTimer.create(timer), timer)
+        with timer.stage('a') as record:
+            record.rows = 1
+        self.assertIsNone(timer.records[0].peak_memory)
+        self.assertEqual(timer.to_dict()['a']['rows'], 1)
+
+    def test_outer_tracing(self):
+        self.assertFalse(StageTimer().trace_memory)
+        tracemalloc.start()
+        try:
+            peak_data = [0] * 100000
+            del peak_data
+            _, peak = tracemalloc.get_traced_memory()
+            with StageTimer(trace_memory=True) as timer:
+                with timer.stage('a'):
+                    pass
+            self.assertTrue(tracemalloc.is_tracing())
+            self.assertGreaterEqual(tracemalloc.get_traced_memory()[1], peak)
+            self.assertIsNone(timer.records[0].peak_memory)
+            self.assertIsNotNone(timer.records[0].memory)
+        finally:
+            tracemalloc.stop()
@@ -0,0 +1,52 @@
+import unittest
+import os
+import numpy as np
+from flightdata.fields import Fields
+from flightdata.data import Flight
+from flightdata.pyramid import lod_path
+
+
+class TestPyramid(unittest.TestCase):
+    def setUp(self):
+        self.flight = Flight.from_csv('test/ekfv3_test.csv')
+        self.pyramid = self.flight.pyramid()
+
+    def test_levels(self):
+        self.assertIs(self.flight.pyramid(), self.pyramid)
+        level = self.pyramid.levels[2]
+        self.assertEqual(len(level), int(np.ceil(len(self.flight.data) / 8)))
+        x = self.flight.data['position_x'].to_numpy()
+        self.assertAlmostEqual(level['position_x_min'].iloc[5], x[40:48].min(), 4)
+        self.assertAlmostEqual(level['position_x_max'].iloc[5], x[40:48].max(), 4)
+        self.assertAlmostEqual(level['position_x_mean'].iloc[5], x[40:48].mean(), 4)
+        self.assertEqual(level.index[5], self.flight.data.index[40])
+
+    def test_query(self):
+        envelope = self.pyramid.query(100, 500, 200, Fields.POSITION.names)
+        self.assertLessEqual(len(envelope), 201)
+        self.assertEqual(envelope.min.shape, (len(envelope), 3))
+        x = self.flight.subset(100, 500).data['position_x']
+        self.assertLessEqual(envelope.min[:, 0].min(), x.min())
+        self.assertGreaterEqual(envelope.max[:, 0].max(), x.max())
+
+        raw = self.pyramid.query(100, 110, 1000)
+        self.assertEqual(raw.level, 0)
+        np.testing.assert_array_equal(raw.min, raw.max)
+
+    def test_save(self):
+        self.flight.to_store('temp.fds', lod=True)
+        flight = Flight.from_store('temp.fds')
+        envelope = flight.pyramid().query(0, 600, 100)
+        expected = self.pyramid.query(0, 600, 100)
+        self.assertEqual(envelope.level, expected.level)
+        np.testing.assert_array_almost_equal(envelope.mean, expected.mean, 4)
+        del flight, envelope
+
+        # saving other data without the pyramid must not leave the old one to be loaded with it
+        self.flight.subset(0, 100).copy().to_store('temp.fds')
+        self.assertFalse(os.path.exists(lod_path('temp.fds')))
+        flight = Flight.from_store('temp.fds')
+        self.assertNotIn('pyramid', flight._cache)
+        self.assertLessEqual(flight.pyramid().query(0, 600, 100).time[-1], flight.duration)
+        del flight
+        os.remove('temp.fds')
@@ -0,0 +1,84 @@
+import unittest
+import os
+import numpy as np
+import pandas as pd
+from flightdata.fields import Fields
+from flightdata.data import Flight
+from flightdata.quality import QualityIndex
+
+
+class TestQuality(unittest.TestCase):
+    def setUp(self):
+        time = np.arange(100) * 0.1
+        sats = np.full(100, 10.0)
+        sats[40:50] = 3
+        latitude = np.full(100, 51.0)
+        latitude[70:80] = np.nan
+        actual = time + 1000
+        actual[90:] += 5
+        data = pd.DataFrame({
+            'time_flight': time, 'time_actual': actual,
+            'global_position_latitude': latitude, 'global_position_longitude': latitude,
+            'gps_sat_count_0': sats}, index=pd.Index(time, name='time_index'))
+        self.flight = Flight(data)
+        self.quality = self.flight.quality()
+
+    def test_spans(self):
+        np.testing.assert_array_almost_equal(
+            self.quality.valid(Fields.GLOBALPOSITION), [[0, 4.0], [5.0, 6.9], [8.0, 9.9]])
+        np.testing.assert_array_almost_equal(self.quality.low_quality(Fields.GLOBALPOSITION), [[4.0, 5.0]])
+        np.testing.assert_array_almost_equal(self.quality.gaps(Fields.GLOBALPOSITION), [[6.9, 8.0]])
+        np.testing.assert_array_almost_equal(self.quality.valid(Fields.TIME), [[0, 8.9], [9.0, 9.9]])
+        self.assertEqual(len(self.quality.valid(Fields.RPM)), 0)
+        np.testing.assert_array_equal(
+            self.quality.is_valid(Fields.GLOBALPOSITION, [0.5, 4.5, 7.5, 9.0, 20]), [True, False, False, True, False])
+
+    def test_per_message(self):
+        # one row per message as from_log reads them, 5 messages each at 2Hz
+        time = np.arange(500) * 0.1
+        data = pd.DataFrame(np.nan, index=pd.Index(time, name='time_index'), columns=Fields.all_names())
+        data['time_flight'] = time
+        rows = {mtype: np.arange(i, 500, 5) for i, mtype in enumerate(['XKF1', 'GPS', 'BARO', 'BAT', 'ARSP'])}
+        data.iloc[rows['XKF1'], data.columns.get_indexer(['time_actual', 'position_x', 'position_y', 'position_z'])] = \
+            np.column_stack([time[rows['XKF1']] + 1000] + [np.ones(100)] * 3)
+        sats = np.where((time[rows['GPS']] > 20) & (time[rows['GPS']] < 30), 3, 12)
+        data.iloc[rows['GPS'], data.columns.get_indexer(
+            ['global_position_latitude', 'global_position_longitude', 'altitude_gps', 'gps_sat_count_0'])] = \
+            np.column_stack([np.full(100, 51.0), np.full(100, -2.0), np.full(100, 100.0), sats])
+        data.iloc[rows['BARO'], data.columns.get_loc('altitude_baro')] = 100.0
+        data.iloc[rows['BAT'], data.columns.get_loc('battery_0')] = 12.0
+        data.iloc[rows['ARSP'], data.columns.get_loc('airspeed_0')] = 20.0
+        quality = Flight(data).quality()
+
+        for field in [Fields.TIME, Fields.POSITION, Fields.SENSORALTITUDE, Fields.BATTERY, Fields.AIRSPEED]:
+            self.assertEqual(len(quality.valid(field)), 1, field.name)
+            self.assertGreater(np.diff(quality.valid(field)[0])[0], 49, field.name)
+        # BARO covers altitude while the GPS has too few satellites
+        self.assertEqual(len(quality.low_quality(Fields.SENSORALTITUDE)), 0)
+        np.testing.assert_array_almost_equal(quality.low_quality(Fields.GLOBALPOSITION), [[20.1, 30.1]])
+        np.testing.assert_array_almost_equal(quality.gaps(Fields.CURRENT), [[0, 49.9]])
+
+    def test_cached(self):
+        self.assertIs(self.flight.quality(), self.quality)
+        self.flight.invalidate(Fields.GLOBALPOSITION)
+        self.assertIsNot(self.flight.quality(), self.quality)
+
+    def test_subset(self):
+        quality = self.flight.subset(3, 8.5).quality()
+        np.testing.assert_array_almost_equal(quality.valid(Fields.GLOBALPOSITION), [[0, 1.0], [2.0, 3.9], [5.0, 5.4]])
+
+    def test_store(self):
+        self.flight.to_store('temp.flight')
+        try:
+            flight = Flight.from_store('temp.flight')
+            self.assertIn('quality', flight._cache)
+            np.testing.assert_array_equal(
+                flight.quality().valid(Fields.GLOBALPOSITION), self.quality.valid(Fields.GLOBALPOSITION))
+        finally:
+            os.remove('temp.flight')
+
+    def test_dict(self):
+        quality = QualityIndex.from_dict(self.quality.to_dict())
+        self.assertEqual(quality.end, self.quality.end)
+        np.testing.assert_array_equal(quality.low_quality(Fields.GLOBALPOSITION), self.quality.low_quality(Fields.GLOBALPOSITION))
+        self.assertEqual(quality.valid(Fields.POSITION).shape, (0, 2))
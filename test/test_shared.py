@@ -0,0 +1,41 @@
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from flightdata.fields import Fields
+from flightdata.data import Flight
+from flightdata.shared import SharedFlight
+from multiprocessing.shared_memory import SharedMemory
+
+
+def _max_altitude(handle):
+    flight = SharedFlight.attach(handle)
+    return float(flight.data['position_z'].max()), flight.duration
+
+
+class TestShared(unittest.TestCase):
+    def setUp(self):
+        self.flight = Flight.from_csv('test/ekfv3_test.csv', compact=True)
+
+    def test_attach(self):
+        with SharedFlight(self.flight) as shared:
+            flight = SharedFlight.attach(shared.handle)
+            self.assertEqual(flight.zero_time, self.flight.zero_time)
+            pd.testing.assert_frame_equal(flight.data, self.flight.data)
+            np.testing.assert_array_equal(
+                flight.quality().valid(Fields.GLOBALPOSITION), self.flight.quality().valid(Fields.GLOBALPOSITION))
+            with self.assertRaises(ValueError):
+                flight.data['position_x'].to_numpy()[0] = 1
+
+    def test_workers(self):
+        with SharedFlight(self.flight) as shared:
+            with ProcessPoolExecutor(max_workers=2) as executor:
+                results = list(executor.map(_max_altitude, [shared.handle] * 4))
+        self.assertEqual(results[0], (float(self.flight.data['position_z'].max()), self.flight.duration))
+
+    def test_release(self):
+        shared = SharedFlight(self.flight)
+        name = shared.handle['name']
+        del shared
+        with self.assertRaises(FileNotFoundError):
+            SharedMemory(name=name)
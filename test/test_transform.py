@@ -0,0 +1,41 @@
+import unittest
+import numpy as np
+from flightdata.fields import Fields
+from flightdata.data import Flight
+from flightdata.transform import Transformation
+
+
+class TestTransform(unittest.TestCase):
+    def setUp(self):
+        self.flight = Flight.from_csv('test/ekfv3_test.csv')
+
+    def test_identity(self):
+        flightcopy = self.flight.transform_arrays({})
+        self.assertEqual(flightcopy.zero_time, self.flight.zero_time)
+        np.testing.assert_array_equal(
+            flightcopy.read_numpy(Fields.POSITION), self.flight.read_numpy(Fields.POSITION))
+
+    def test_heading(self):
+        flightcopy = self.flight.transform_arrays(Transformation(np.pi / 2).handlers())
+        position = self.flight.read_numpy(Fields.POSITION)
+        rotated = flightcopy.read_numpy(Fields.POSITION)
+        np.testing.assert_array_almost_equal(rotated[0], position[1])
+        np.testing.assert_array_almost_equal(rotated[1], -position[0])
+        np.testing.assert_array_equal(rotated[2], position[2])
+        np.testing.assert_array_equal(
+            flightcopy.read_numpy(Fields.AXISRATE), self.flight.read_numpy(Fields.AXISRATE))
+
+    def test_gps(self):
+        origin = self.flight.origin()
+        flightcopy = self.flight.transform_arrays(Transformation(0, origin).handlers())
+        local = flightcopy.read_fields(Fields.GLOBALPOSITION).dropna().to_numpy()
+        self.assertLess(np.abs(local).max(), 5000)
+
+    def test_some_fields(self):
+        data = self.flight.read_fields([Fields.TIME, Fields.POSITION]).assign(note=1)
+        flight = Flight(data, self.flight.parameters, self.flight.zero_time)
+        flightcopy = flight.transform_arrays(Transformation(np.pi / 2).handlers())
+        self.assertEqual(flightcopy.data.columns.to_list(), data.columns.to_list())
+        np.testing.assert_array_equal(flightcopy.data['note'], 1)
+        np.testing.assert_array_almost_equal(
+            flightcopy.read_numpy(Fields.POSITION)[0], self.flight.read_numpy(Fields.POSITION)[1])